@@ -0,0 +1,138 @@
+"""Process-wide registry of sounds, music and fonts.
+
+Each asset is loaded from disk once per process and the same handle is
+handed to every caller, so building a level (or replaying one) never
+decodes a file again. preload() can warm the registry on a background
+thread while a menu is showing; a caller asking for an asset that is still
+being loaded waits for that load instead of starting a second one. Load
+times are kept per asset for report().
+"""
+import io
+import os
+import threading
+import time
+
+import pygame
+
+
+class AssetRegistry:
+    """Shared, load-once handles for sounds, music and fonts"""
+
+    def __init__(self):
+        self.assets = {}  # (kind, path, ...) -> loaded asset, or None if loading failed
+        self.timings = {}  # key -> (seconds, thread name)
+        self.preload_time = None  # (seconds, number of assets) of the last preload
+        self._loading = {}  # key -> threading.Event set when its load finishes
+        self._lock = threading.Lock()
+        self._music_stream = None
+        self._thread = None
+
+    def _get(self, key, load):
+        with self._lock:
+            if key in self.assets:
+                return self.assets[key]
+            done = self._loading.get(key)
+            loader = done is None
+            if loader:
+                done = self._loading[key] = threading.Event()
+        if not loader:
+            done.wait()  # Another thread is loading it right now
+            return self.assets.get(key)
+
+        start = time.perf_counter()
+        asset = None  # Remembered on failure, so a missing file is not retried every level
+        try:
+            asset = load()
+        except (pygame.error, OSError) as e:
+            print(f"Error loading {key[0]} {key[1]}: {e}")
+        finally:
+            # Waiting threads are released even if the load raised something unexpected
+            with self._lock:
+                self.assets[key] = asset
+                self.timings[key] = (time.perf_counter() - start, threading.current_thread().name)
+                del self._loading[key]
+            done.set()
+        return asset
+
+    def sound(self, path, volume=1.0):
+        """Shared pygame.mixer.Sound for `path` (None if it can't be loaded).
+
+        The volume is applied when the sound is first loaded.
+        """
+        def load():
+            sound = pygame.mixer.Sound(path)
+            sound.set_volume(volume)
+            return sound
+        return self._get(("sound", path), load)
+
+    def music_data(self, path):
+        """Bytes of a music file, read once (None if it can't be read)"""
+        def load():
+            with open(path, "rb") as f:
+                return f.read()
+        return self._get(("music", path), load)
+
+    def play_music(self, path, volume=1.0, loops=-1):
+        """Stream music from its in-memory copy; returns False if it can't be played"""
+        data = self.music_data(path)
+        if data is None:
+            return False
+        try:
+            stream = io.BytesIO(data)
+            pygame.mixer.music.load(stream, os.path.splitext(path)[1].lstrip("."))
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(loops)
+        except pygame.error as e:
+            print(f"Error playing music {path}: {e}")
+            return False
+        self._music_stream = stream  # The mixer streams from it while the music plays
+        return True
+
+    def font(self, path, size):
+        """Shared pygame.font.Font (path None is pygame's default font)"""
+        return self._get(("font", path, size), lambda: pygame.font.Font(path, size))
+
+    def preload(self, sounds=(), music=(), fonts=(), background=True):
+        """Load assets ahead of use: sounds as (path, volume), music paths, fonts as (path, size).
+
+        With `background` the loads run on a daemon thread, which is returned.
+        Fonts are always loaded on the calling thread because SDL_ttf is not
+        safe to use from two threads at once.
+        """
+        for path, size in fonts:
+            self.font(path, size)
+
+        def load_all():
+            start = time.perf_counter()
+            for path, volume in sounds:
+                self.sound(path, volume)
+            for path in music:
+                self.music_data(path)
+            self.preload_time = (time.perf_counter() - start, len(sounds) + len(music))
+
+        if not background:
+            load_all()
+            return None
+        self._thread = threading.Thread(target=load_all, name="asset-preload", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def wait(self):
+        """Block until a background preload has finished"""
+        if self._thread is not None:
+            self._thread.join()
+
+    def report(self):
+        """One line per loaded asset with its load time, slowest first"""
+        lines = []
+        for key, (seconds, thread) in sorted(self.timings.items(), key=lambda item: -item[1][0]):
+            status = "failed" if self.assets.get(key) is None else "ok"
+            name = " ".join([os.path.basename(str(key[1]))] + [str(part) for part in key[2:]])
+            lines.append(f"{key[0]:<6}{name:<24}{seconds * 1000:8.2f}ms  {status} ({thread})")
+        if self.preload_time is not None:
+            seconds, count = self.preload_time
+            lines.append(f"Preloaded {count} asset(s) in {seconds * 1000:.2f}ms")
+        return "\n".join(lines)
+
+
+ASSETS = AssetRegistry()
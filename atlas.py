@@ -0,0 +1,63 @@
+"""Texture atlas for small procedurally drawn sprites"""
+import pygame
+
+
+class SpriteAtlas:
+    """Packs many small images into a few shared page surfaces.
+
+    Each image is drawn once into a free slot of a page and handed out as a
+    subsurface, so every sprite showing it references the same pixels.
+    Opaque and per-pixel-alpha images go on separate pages so opaque sprites
+    keep blitting without blending. Pages are filled shelf by shelf.
+    """
+
+    def __init__(self, page_size=256):
+        self.page_size = page_size
+        self.pages = []
+        self.images = {}  # name -> subsurface, or list of subsurfaces for an animation
+        self._shelves = {}  # alpha -> [page, x, y, shelf height] of the page being filled
+
+    def __contains__(self, name):
+        return name in self.images
+
+    def __getitem__(self, name):
+        return self.images[name]
+
+    def _new_page(self, alpha, width, height):
+        size = (max(self.page_size, width), max(self.page_size, height))
+        page = pygame.Surface(size, pygame.SRCALPHA) if alpha else pygame.Surface(size)
+        self.pages.append(page)
+        return [page, 0, 0, 0]
+
+    def _place(self, size, alpha):
+        """Reserve a size[0] x size[1] slot and return it as a subsurface"""
+        width, height = size
+        shelf = self._shelves.get(alpha)
+        if shelf is None:
+            shelf = self._shelves[alpha] = self._new_page(alpha, width, height)
+        page, x, y, shelf_height = shelf
+        if x + width > page.get_width():
+            # Start the next shelf below the tallest image on this one
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if y + height > page.get_height():
+            shelf = self._shelves[alpha] = self._new_page(alpha, width, height)
+            page, x, y, shelf_height = shelf
+        shelf[1:] = [x + width, y, max(shelf_height, height)]
+        return page.subsurface((x, y, width, height))
+
+    def add(self, name, size, draw, alpha=False):
+        """Draw an image once with draw(surface) and store it under `name`"""
+        image = self._place(size, alpha)
+        draw(image)
+        self.images[name] = image
+        return image
+
+    def add_frames(self, name, size, draw, count, alpha=False):
+        """Draw `count` animation frames with draw(surface, frame) and store them under `name`"""
+        frames = []
+        for frame in range(count):
+            image = self._place(size, alpha)
+            draw(image, frame)
+            frames.append(image)
+        self.images[name] = frames
+        return frames
@@ -0,0 +1,102 @@
+"""Sound effect mixer with per-category channels and voice limiting.
+
+Sounds are not played the moment game code asks for them. They are queued
+for the frame and started together by flush(), which
+- plays each sound at most once per category per frame, however many
+  times it was requested (twenty kills in one sweep are one explosion),
+- plays a category's sounds only on the channels reserved for it, so
+  pickups can never crowd out combat sounds or the other way round, and
+- when all of a category's channels are busy, steals the one playing the
+  lowest-priority, oldest sound, provided the new sound's priority is at
+  least as high; otherwise the new sound is dropped.
+
+The number of voices is therefore fixed by the category table.
+"""
+import pygame
+
+
+class SoundMixer:
+    """Queues sound effects per frame and plays them on reserved channels by priority"""
+
+    def __init__(self, categories, free_channels=4):
+        self.categories = dict(categories)  # name -> number of reserved channels
+        self.free_channels = free_channels  # Left unreserved for plain Sound.play() elsewhere
+        self.channels = None  # name -> [pygame.mixer.Channel], set up on first flush
+        self.voices = {}  # channel -> (priority, frame started)
+        self.pending = {}  # (category, sound) -> priority, for the current frame
+        self.frame = 0
+        self.stats = {"requested": 0, "played": 0, "deduplicated": 0, "stolen": 0, "dropped": 0}
+
+    def _setup(self):
+        """Reserve channels for every category; returns False when there is no mixer"""
+        if self.channels is not None:
+            return True
+        if not pygame.mixer.get_init():
+            return False
+        reserved = sum(self.categories.values())
+        if pygame.mixer.get_num_channels() < reserved + self.free_channels:
+            pygame.mixer.set_num_channels(reserved + self.free_channels)
+        # Reserved channels are skipped when Sound.play() picks one by itself
+        pygame.mixer.set_reserved(reserved)
+        self.channels = {}
+        index = 0
+        for name, count in self.categories.items():
+            self.channels[name] = [pygame.mixer.Channel(index + i) for i in range(count)]
+            index += count
+        return True
+
+    def play(self, category, sound, priority=0):
+        """Queue `sound` on `category`'s channels for this frame"""
+        self.stats["requested"] += 1
+        key = (category, sound)
+        if key in self.pending:
+            self.stats["deduplicated"] += 1
+            if priority <= self.pending[key]:
+                return
+        self.pending[key] = priority
+
+    def flush(self):
+        """Start this frame's queued sounds, highest priority first"""
+        self.frame += 1
+        if not self.pending:
+            return
+        pending = sorted(self.pending.items(), key=lambda item: -item[1])
+        self.pending.clear()
+        if not self._setup():
+            return
+        for (category, sound), priority in pending:
+            channel = self._pick_channel(category, priority)
+            if channel is None:
+                self.stats["dropped"] += 1
+                continue
+            channel.play(sound)
+            self.voices[channel] = (priority, self.frame)
+            self.stats["played"] += 1
+
+    def _pick_channel(self, category, priority):
+        """An idle channel of the category, else the voice to steal, else None"""
+        victim = None
+        victim_key = None
+        for channel in self.channels[category]:
+            if not channel.get_busy():
+                return channel
+            key = self.voices.get(channel, (0, 0))
+            if key[1] == self.frame:
+                continue  # Started by this flush; never cut off a sound before it is heard
+            # Lowest priority first, then the longest playing
+            if victim_key is None or key < victim_key:
+                victim, victim_key = channel, key
+        if victim is not None and victim_key[0] <= priority:
+            self.stats["stolen"] += 1
+            return victim
+        return None
+
+    def clear(self):
+        """Forget sounds queued but not yet flushed"""
+        self.pending.clear()
+
+    def stop(self):
+        """Stop every voice the mixer started"""
+        for channel in self.voices:
+            channel.stop()
+        self.voices.clear()
@@ -0,0 +1,187 @@
+"""Batch AI-vs-AI match runner for difficulty/weapon balance sweeps.
+
+Plays seeded headless matches for every weapon pair x difficulty x map
+across a process pool and streams the results into a compact columnar
+file (see write_results/read_results for the layout).
+
+Usage: python batch.py --matches 10 --out balance_results.rres
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import random
+import struct
+import sys
+import time
+from array import array
+from constants import *
+
+RESULTS_MAGIC = b"RRES"
+RESULTS_VERSION = 1
+CHUNK_ROWS = 4096
+DEFAULT_MAX_FRAMES = FPS * 180  # Three minutes of game time, then it's a draw
+
+WINNERS = ["Player", "Enemy", "Draw"]
+
+# Column name -> array typecode ('B' = uint8 category index, 'I' = uint32)
+COLUMNS = [
+    ("player_weapon", "B"),
+    ("enemy_weapon", "B"),
+    ("difficulty", "B"),
+    ("map", "B"),
+    ("seed", "I"),
+    ("winner", "B"),
+    ("frames", "I"),
+    ("player_damage", "I"),
+    ("enemy_damage", "I"),
+]
+
+CATEGORIES = {
+    "player_weapon": list(WEAPONS.keys()),
+    "enemy_weapon": list(WEAPONS.keys()),
+    "difficulty": list(DIFFICULTY_LEVELS.keys()),
+    "map": list(MAPS.keys()),
+    "winner": WINNERS,
+}
+
+
+def play_match(task):
+    """Play one headless AI-vs-AI match and return a result row (tuple of column values)"""
+    # Imported here so the parent process never needs pygame surfaces
+    from game import Game
+    from map import Map
+
+    player_weapon, enemy_weapon, difficulty, map_name, seed, max_frames = task
+    random.seed(seed)
+
+    game = Game(headless=True)
+    game.game_mode = "Rumble Mode"
+    game.difficulty = difficulty
+    game.difficulty_config = DIFFICULTY_LEVELS[difficulty]
+    game.current_map = Map(map_name)
+    game.player_weapon = player_weapon
+    game.player_color = BLUE
+    game.start_game(enemy_weapon=enemy_weapon, player_ai=True)
+
+    frames = game.simulate(max_frames)
+    winner = game.game_over_winner if game.state == "game_over" else "Draw"
+
+    return (
+        CATEGORIES["player_weapon"].index(player_weapon),
+        CATEGORIES["enemy_weapon"].index(enemy_weapon),
+        CATEGORIES["difficulty"].index(difficulty),
+        CATEGORIES["map"].index(map_name),
+        seed,
+        WINNERS.index(winner),
+        frames,
+        game.damage_dealt["player"],
+        game.damage_dealt["enemy"],
+    )
+
+
+def build_tasks(matches, base_seed=0, max_frames=DEFAULT_MAX_FRAMES):
+    """Every weapon pair x difficulty x map, `matches` seeded matches each"""
+    tasks = []
+    combos = itertools.product(WEAPONS, WEAPONS, DIFFICULTY_LEVELS, MAPS)
+    for i, (pw, ew, diff, map_name) in enumerate(combos):
+        for m in range(matches):
+            tasks.append((pw, ew, diff, map_name, base_seed + i * matches + m, max_frames))
+    return tasks
+
+
+def _write_chunk(f, rows):
+    f.write(struct.pack("<I", len(rows)))
+    for col, (name, typecode) in enumerate(COLUMNS):
+        values = array(typecode, (row[col] for row in rows))
+        if sys.byteorder != "little":
+            values.byteswap()
+        f.write(values.tobytes())
+
+
+def write_results(path, rows):
+    """Stream result rows into a columnar file, CHUNK_ROWS rows per chunk.
+
+    Layout: magic, version byte, uint32 header length, JSON header with the
+    column list and category names, then chunks of (uint32 row count,
+    one packed array per column).
+    Returns the number of rows written.
+    """
+    header = json.dumps({"columns": COLUMNS, "categories": CATEGORIES}).encode("utf-8")
+    count = 0
+    with open(path, "wb") as f:
+        f.write(RESULTS_MAGIC + struct.pack("<BI", RESULTS_VERSION, len(header)))
+        f.write(header)
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            count += 1
+            if len(chunk) >= CHUNK_ROWS:
+                _write_chunk(f, chunk)
+                chunk = []
+        if chunk:
+            _write_chunk(f, chunk)
+    return count
+
+
+def read_results(path):
+    """Read a results file back into {column: list}, with categories decoded to names"""
+    with open(path, "rb") as f:
+        if f.read(4) != RESULTS_MAGIC:
+            raise ValueError(f"{path} is not a results file")
+        version, header_len = struct.unpack("<BI", f.read(5))
+        if version != RESULTS_VERSION:
+            raise ValueError(f"Unsupported results version {version}")
+        header = json.loads(f.read(header_len))
+        columns = {name: array(typecode) for name, typecode in header["columns"]}
+        while True:
+            raw = f.read(4)
+            if not raw:
+                break
+            (nrows,) = struct.unpack("<I", raw)
+            for name, typecode in header["columns"]:
+                values = array(typecode)
+                values.frombytes(f.read(nrows * values.itemsize))
+                if sys.byteorder != "little":
+                    values.byteswap()
+                columns[name].extend(values)
+
+    results = {}
+    for name, values in columns.items():
+        names = header["categories"].get(name)
+        results[name] = [names[v] for v in values] if names else list(values)
+    return results
+
+
+def run_sweep(matches, out_path, processes=None, base_seed=0, max_frames=DEFAULT_MAX_FRAMES):
+    """Run the full sweep on a process pool; returns the number of matches played"""
+    tasks = build_tasks(matches, base_seed, max_frames)
+    with multiprocessing.Pool(processes) as pool:
+        rows = pool.imap_unordered(play_match, tasks, chunksize=16)
+        return write_results(out_path, rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ultimate Rumble balance sweep")
+    parser.add_argument("--matches", type=int, default=10, help="matches per weapon pair/difficulty/map")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="base seed")
+    parser.add_argument("--max-frames", type=int, default=DEFAULT_MAX_FRAMES, help="frame limit per match")
+    parser.add_argument("--out", default="balance_results.rres", help="output file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = run_sweep(args.matches, args.out, args.processes, args.seed, args.max_frames)
+    elapsed = time.perf_counter() - start
+    print(f"{count} matches in {elapsed:.1f}s -> {args.out}")
+
+    # Quick summary: player win rate per difficulty
+    results = read_results(args.out)
+    for difficulty in DIFFICULTY_LEVELS:
+        winners = [w for w, d in zip(results["winner"], results["difficulty"]) if d == difficulty]
+        if winners:
+            print(f"{difficulty:>7}: player wins {winners.count('Player') / len(winners):.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+"""Headless benchmarks for the rendering and simulation hot paths.
+
+Every benchmark runs against the SDL dummy video/audio drivers with fixed
+seeds, so two runs on the same machine exercise exactly the same work.
+Results are written as JSON and can be compared against a stored baseline
+from an earlier run; a benchmark whose best time got slower by more than
+the threshold is reported as a regression (exit status 1).
+
+Usage:
+    python benchmarks.py --save-baseline          # record bench_baseline.json
+    python benchmarks.py                          # run and compare against it
+    python benchmarks.py --filter map_draw --quick
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+DEFAULT_OUT = "bench_results.json"
+DEFAULT_BASELINE = "bench_baseline.json"
+DEFAULT_THRESHOLD = 0.25  # Flag benchmarks more than 25% slower than the baseline
+MIN_REPEAT_TIME = 0.02  # Seconds each timed repeat should last at least
+MAX_NUMBER = 100000
+
+
+# ============ BENCHMARK CASES ============
+# Each *_cases function returns a list of (name, params, func). Setup happens
+# in the function itself; only func is timed.
+
+def map_draw_cases():
+    """Map.draw for every map, from a cold background cache and warm, at two screen sizes"""
+    import pygame
+    from constants import MAPS, SCREEN_WIDTH, SCREEN_HEIGHT
+    from map import Map, clear_background_cache
+
+    cases = []
+    for scale in (1, 2):
+        size = (SCREEN_WIDTH * scale, SCREEN_HEIGHT * scale)
+        screen = pygame.Surface(size, 0, pygame.display.get_surface())
+        for map_name in MAPS:
+            game_map = Map(map_name)
+
+            def cold(game_map=game_map, screen=screen):
+                clear_background_cache()
+                game_map.draw(screen)
+
+            cases.append((f"map_draw[{map_name},{size[0]}x{size[1]},cold]",
+                          {"map": map_name, "size": list(size), "cache": "cold"}, cold))
+            cases.append((f"map_draw[{map_name},{size[0]}x{size[1]},warm]",
+                          {"map": map_name, "size": list(size), "cache": "warm"},
+                          lambda game_map=game_map, screen=screen: game_map.draw(screen)))
+    return cases
+
+
+def game_ui_cases():
+    """UIManager.draw_game_ui with unchanged text (cache hits) and with health changing every frame"""
+    import pygame
+    from constants import SCREEN_WIDTH, SCREEN_HEIGHT, WEAPONS
+    from enemy import Enemy
+    from player import Player
+    from ui import UIManager
+
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), 0, pygame.display.get_surface())
+    weapons = list(WEAPONS)
+    ui = UIManager()
+    player = Player(100, 400, weapons[0])
+    enemy = Enemy(900, 400, weapons[-1])
+    cases = []
+    for mode in (None, "Endless Mode"):
+        label = "hud" if mode is None else "hud+mode"
+
+        def static(mode=mode):
+            ui.draw_game_ui(screen, player, enemy, mode, "normal", map_name="Arena")
+
+        def changing(mode=mode):
+            # A new health value every call forces fresh text renders
+            player.health = (player.health - 1) % (player.max_health + 1)
+            enemy.health = (enemy.health + 1) % (enemy.max_health + 1)
+            ui.draw_game_ui(screen, player, enemy, mode, "normal", enemies_defeated=player.health,
+                            map_name="Arena")
+
+        cases.append((f"game_ui[{label},static]", {"mode": mode, "text": "static"}, static))
+        cases.append((f"game_ui[{label},changing]", {"mode": mode, "text": "changing"}, changing))
+    return cases
+
+
+def weapon_surface_cases():
+    """weapons.get_weapon_surface for every weapon and facing, cold and warm, per scale"""
+    import weapons
+    from constants import WEAPONS
+
+    cases = []
+    for scale in (1, 2, 4):
+        keys = [(name, info["color"], scale, facing) for name, info in WEAPONS.items() for facing in (1, -1)]
+
+        def cold(keys=keys):
+            weapons._WEAPON_CACHE.clear()
+            for key in keys:
+                weapons.get_weapon_surface(*key)
+
+        def warm(keys=keys):
+            for key in keys:
+                weapons.get_weapon_surface(*key)
+
+        params = {"scale": scale, "surfaces": len(keys)}
+        cases.append((f"weapon_surface[x{scale},cold]", dict(params, cache="cold"), cold))
+        cases.append((f"weapon_surface[x{scale},warm]", dict(params, cache="warm"), warm))
+    return cases
+
+
+def _quest_levels():
+    """(label, level) for the hand-made quest_madness levels and generated ones of growing length"""
+    import quest_madness
+    from level_gen import LevelGenerator
+
+    class TemplateLevel(quest_madness.Level):
+        def __init__(self, template):
+            self.template = template
+            super().__init__(0, seed=0)
+
+        def load_template(self):
+            return self.template
+
+    levels = []
+    for level_num in range(1, quest_madness.count_levels() + 1):
+        levels.append((f"level{level_num}", quest_madness.Level(level_num, seed=0)))
+    for width in (16000, 64000):
+        levels.append((f"generated{width}", TemplateLevel(LevelGenerator(0).generate(width))))
+    for _, level in levels:
+        level.sounds_enabled = False
+    return levels
+
+
+def level_draw_cases():
+    """quest_madness Level.draw at 30 camera positions spread over each level"""
+    import pygame
+    import quest_madness
+
+    screen = pygame.Surface((quest_madness.SCREEN_WIDTH, quest_madness.SCREEN_HEIGHT), 0,
+                            pygame.display.get_surface())
+    font = pygame.font.Font(None, 36)
+    cases = []
+    for label, level in _quest_levels():
+        span = level.width - quest_madness.SCREEN_WIDTH
+        cameras = [span * i / 29 for i in range(30)]
+
+        def draw(level=level, cameras=cameras):
+            for camera_x in cameras:
+                level.camera_x = camera_x
+                level.draw(screen, font)
+
+        cases.append((f"level_draw[{label}]", {"level": label, "width": level.width, "frames": 30}, draw))
+    return cases
+
+
+def player_update_cases():
+    """quest_madness Player.update for 600 frames of running and jumping from the spawn point"""
+    import pygame
+    from replay import ReplayKeys, encode_keys
+
+    class Held:
+        def __getitem__(self, key):
+            return key in (pygame.K_RIGHT, pygame.K_SPACE)
+
+    keys = ReplayKeys(encode_keys(Held()))
+    cases = []
+    for label, level in _quest_levels():
+        player = level.player
+        start = player.rect.topleft
+        pickups = [(level.coins, list(level.coins)), (level.collectibles, list(level.collectibles))]
+
+        def run(level=level, player=player, start=start, pickups=pickups):
+            # Every call starts from the same state: spawn point, nothing collected
+            player.rect.topleft = start
+            player.checkpoint_x, player.checkpoint_y = start
+            player.vel_x = player.vel_y = 0
+            player.health = 100
+            player.on_ground = player.on_wall = False
+            for grid, objects in pickups:
+                for obj in objects:
+                    if obj not in grid:
+                        grid.add(obj, obj.get_bounds())
+                        level.entities.add(obj)
+            level.particles.clear()
+            for _ in range(600):
+                player.handle_input(keys)
+                result = player.update(level.platforms, level.spikes, level.coins, level.collectibles,
+                                       level.goal, level.particles)
+                if result == "dead":
+                    player.respawn(level.particles)
+                elif result == "goal":
+                    break
+
+        cases.append((f"player_update[{label}]", {"level": label, "frames": 600}, run))
+    return cases
+
+
+def entity_update_cases():
+    """quest_madness EntityStore.update (patrol, bob and animation systems) for 600 frames per level"""
+    cases = []
+    for label, level in _quest_levels():
+        def run(entities=level.entities):
+            for _ in range(600):
+                entities.update()
+
+        cases.append((f"entity_update[{label}]", {"level": label, "entities": len(level.entities), "frames": 600},
+                      run))
+    return cases
+
+
+def particle_storm_cases():
+    """Enemy.kill_enemy bursts from many enemies at once, then their particles updated and drawn to the end"""
+    import pygame
+    import quest_madness
+    from particles import ParticleSystem
+
+    screen = pygame.Surface((quest_madness.SCREEN_WIDTH, quest_madness.SCREEN_HEIGHT), 0,
+                            pygame.display.get_surface())
+    cases = []
+    for count in (1, 20, 100):
+        rng = random.Random(count)
+        enemies = [quest_madness.Enemy(rng.randrange(50, 1150), rng.randrange(100, 600))
+                   for _ in range(count)]
+
+        def storm(enemies=enemies):
+            particles = ParticleSystem(seed=0)
+            for enemy in enemies:
+                enemy.kill_enemy(particles)
+            while len(particles):
+                particles.update()
+                particles.draw(screen)
+
+        cases.append((f"particle_storm[{count}]", {"enemies": count}, storm))
+    return cases
+
+
+def survival_screen_cases():
+    """SurvivalGame.draw_main_screen with growing inventories and message logs"""
+    import game_pygame
+
+    game = game_pygame.SurvivalGame()
+    game.player_name = "Bench"
+    game.state = game_pygame.GameState.EXPLORING
+    cases = []
+    for size in (0, 10, 100):
+        def draw(size=size):
+            game.inventory = [f"item {i}" for i in range(size)]
+            game.message_log = [f"event {i}: something happened in the woods" for i in range(size)]
+            game.draw_main_screen()
+
+        cases.append((f"survival_main_screen[{size}]", {"inventory": size, "messages": size}, draw))
+    return cases
+
+
+SUITES = [
+    ("map_draw", map_draw_cases),
+    ("game_ui", game_ui_cases),
+    ("weapon_surface", weapon_surface_cases),
+    ("level_draw", level_draw_cases),
+    ("player_update", player_update_cases),
+    ("entity_update", entity_update_cases),
+    ("particle_storm", particle_storm_cases),
+    ("survival_main_screen", survival_screen_cases),
+]
+
+
+# ============ TIMING ============
+
+def calibrate(func, min_time):
+    """Number of calls needed for one repeat to last at least `min_time` (doubles like timeit)"""
+    number = 1
+    while number < MAX_NUMBER:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= min_time:
+            break
+        number *= 2
+    return number
+
+
+def measure(func, repeat, min_time):
+    """Time `func`; returns (calls per repeat, [seconds per call for each repeat])"""
+    func()  # Warm-up call: first-use caches, lazy imports
+    number = calibrate(func, min_time)
+    times = []
+    for _ in range(repeat):
+        random.seed(0)
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return number, times
+
+
+def run_benchmarks(name_filter=None, repeat=5, min_time=MIN_REPEAT_TIME):
+    """Run every benchmark whose name contains `name_filter`; returns the results document"""
+    import pygame
+    pygame.init()
+    pygame.display.set_mode((1200, 800))
+
+    results = {}
+    for suite, make_cases in SUITES:
+        random.seed(0)
+        for name, params, func in make_cases():
+            if name_filter and name_filter not in name:
+                continue
+            number, times = measure(func, repeat, min_time)
+            results[name] = {
+                "suite": suite,
+                "params": params,
+                "number": number,
+                "repeat": repeat,
+                "best_us": min(times) * 1e6,
+                "median_us": statistics.median(times) * 1e6,
+            }
+            print(f"{name:<48}{min(times) * 1e6:12.1f} us  (median {statistics.median(times) * 1e6:.1f}, {number}x{repeat})")
+
+    import numpy
+    return {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "sdl": ".".join(map(str, pygame.get_sdl_version())),
+            "numpy": numpy.__version__,
+            "machine": platform.machine(),
+            "system": platform.platform(),
+            "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Compare best times against a baseline; returns (regressions, improvements) as (name, ratio) lists"""
+    regressions = []
+    improvements = []
+    old_results = baseline.get("results", {})
+    for name, result in results["results"].items():
+        old = old_results.get(name)
+        if old is None or old["best_us"] <= 0:
+            continue
+        ratio = result["best_us"] / old["best_us"]
+        if ratio > 1 + threshold:
+            regressions.append((name, ratio))
+        elif ratio < 1 / (1 + threshold):
+            improvements.append((name, ratio))
+    return regressions, improvements
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless rendering/simulation benchmarks")
+    parser.add_argument("--filter", default=None, help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repeats per benchmark (best is kept)")
+    parser.add_argument("--quick", action="store_true", help="fewer, shorter repeats")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="where to write the results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown ratio above which a benchmark counts as regressed")
+    args = parser.parse_args()
+
+    # No window or sound device needed
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+    repeat, min_time = (3, MIN_REPEAT_TIME / 4) if args.quick else (args.repeat, MIN_REPEAT_TIME)
+    start = time.perf_counter()
+    results = run_benchmarks(args.filter, repeat, min_time)
+    print(f"{len(results['results'])} benchmarks in {time.perf_counter() - start:.1f}s")
+
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=1)
+    print(f"Results written to {args.out}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=1)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions, improvements = compare(results, baseline, args.threshold)
+    for name, ratio in improvements:
+        print(f"  faster: {name} ({ratio:.2f}x baseline time)")
+    for name, ratio in regressions:
+        print(f"  REGRESSION: {name} ({ratio:.2f}x baseline time)")
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%} against {args.baseline}")
+        sys.exit(1)
+    print(f"No regressions over {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 700
 FPS = 60
+FIXED_DT = 1.0 / FPS  # Seconds of game time per simulation step
+MAX_FRAME_TIME = 0.25  # Clamp for long frames so the accumulator can't spiral
 
 # Colors
 BG_COLOR = (20, 20, 40)
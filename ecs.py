@@ -0,0 +1,265 @@
+"""Array-backed entity store for level objects.
+
+Every entity that changes from frame to frame lives in an EntityStore as
+one row of parallel NumPy columns (position, velocity, patrol, bob phase,
+animation, attack cooldown, alive flag). EntityStore.update() runs each
+system over all rows in a few whole-column operations, then pushes the
+results back only to the entities whose pixel position, animation frame
+or state actually changed, and re-buckets an entity in its SpatialGrid
+only when it crossed into another cell.
+
+Entity objects are handles: they keep their rect and image for drawing and
+collisions, while their component attributes (declared with Column) read
+and write the store's columns as long as the entity is in a store.
+"""
+import numpy as np
+
+# Column name -> dtype; one row per entity
+COLUMNS = {
+    # Position, the pixel position last pushed to the rect and the grid cells it spans
+    # (whole numbers are kept in floats so the per-frame maths needs no casts)
+    "x": np.float64, "y": np.float64, "rect_x": np.float64, "rect_y": np.float64,
+    "width": np.float64, "cell0": np.float64, "cell1": np.float64,
+    # Pixel position at the start of the current step, for drawing between steps
+    "prev_x": np.float64, "prev_y": np.float64,
+    "alive": np.bool_,
+    # Patrol: x += vel_x, turning around when more than patrol_range from origin_x
+    "patrol": np.bool_, "vel_x": np.float64, "origin_x": np.float64, "patrol_range": np.float64,
+    # Bob: y = origin_y + sin(bob_t * bob_scale) * bob_amp, with bob_t += bob_step
+    "bob": np.bool_, "origin_y": np.float64, "bob_t": np.float64, "bob_step": np.float64,
+    "bob_scale": np.float64, "bob_amp": np.float64,
+    # Animation: anim_t cycles through anim_period, shown as one of anim_frames frames
+    "anim": np.bool_, "anim_t": np.float64, "anim_step": np.float64, "anim_period": np.float64,
+    "anim_frames": np.float64, "frame": np.float64,
+    # Frames left before an attack ends
+    "cooldown": np.int64,
+}
+
+COMPONENTS = ("patrol", "bob", "anim")
+
+_COLUMN_FIELDS = {}  # Entity class -> [(attribute, Column)]
+
+
+def round_half_away(values):
+    """Round like pygame does when a float is assigned to a Rect coordinate"""
+    return np.trunc(values + np.copysign(0.5, values))
+
+
+class Column:
+    """Entity attribute kept in an EntityStore column while the entity is in a store"""
+
+    def __init__(self, column, default=0):
+        self.column = column
+        self.default = default
+        self.cast = {np.bool_: bool, np.int64: int}.get(COLUMNS[column], float)
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.key = "_" + name
+
+    def __get__(self, entity, owner):
+        if entity is None:
+            return self
+        if entity.store is not None:
+            return self.cast(entity.store.columns[self.column][entity.index])
+        return entity.__dict__.get(self.key, self.default)
+
+    def __set__(self, entity, value):
+        if entity.store is not None:
+            entity.store.columns[self.column][entity.index] = value
+        else:
+            entity.__dict__[self.key] = value
+
+
+def column_fields(cls):
+    """(attribute, Column) pairs declared by an entity class and its bases"""
+    fields = _COLUMN_FIELDS.get(cls)
+    if fields is None:
+        fields = []
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if isinstance(value, Column):
+                    fields.append((name, value))
+        _COLUMN_FIELDS[cls] = fields
+    return fields
+
+
+class Entity:
+    """Base class for level objects: a rect and image plus component data.
+
+    Subclasses list the systems they take part in in COMPONENTS and declare
+    the data those systems use as Column attributes.
+    """
+
+    COMPONENTS = ()
+    store = None
+    index = -1
+    grid = None
+
+    def update_image(self):
+        """Pick the image for the current state (called when it may have changed)"""
+
+    def despawn(self):
+        """Leave the store, keeping the current component values on the handle"""
+        if self.store is not None:
+            self.store.remove(self)
+
+
+class EntityStore:
+    """Component columns for every entity of a level, updated in batches"""
+
+    def __init__(self, capacity=256, cell_size=128):
+        self.cell_size = cell_size
+        self.count = 0
+        self.entities = []  # row -> entity
+        self.columns = {name: np.zeros(capacity, dtype) for name, dtype in COLUMNS.items()}
+        self._views = None  # Column name -> view of the rows in use, rebuilt after add/remove
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(list(self.entities))
+
+    def _grow(self):
+        for name, column in self.columns.items():
+            grown = np.zeros(len(column) * 2, column.dtype)
+            grown[:self.count] = column[:self.count]
+            self.columns[name] = grown
+
+    def add(self, entity, grid=None):
+        """Store `entity`; `grid` is the SpatialGrid to re-bucket it in when it moves"""
+        if self.count == len(self.columns["x"]):
+            self._grow()
+        index = self.count
+        columns = self.columns
+        for column in columns.values():
+            column[index] = 0  # Clear what a removed entity left in this row
+        columns["anim_period"][index] = 1  # Keeps the frame maths defined for rows that don't animate
+        rect = entity.rect
+        columns["x"][index] = columns["rect_x"][index] = columns["prev_x"][index] = rect.x
+        columns["y"][index] = columns["rect_y"][index] = columns["prev_y"][index] = rect.y
+        columns["width"][index] = rect.width
+        columns["cell0"][index] = rect.left // self.cell_size
+        columns["cell1"][index] = (rect.right - 1) // self.cell_size
+        columns["alive"][index] = True  # Unless the entity declares its own alive Column
+        for component in COMPONENTS:
+            columns[component][index] = component in entity.COMPONENTS
+        values = [(field.column, getattr(entity, name)) for name, field in column_fields(type(entity))]
+        entity.store = self
+        entity.index = index
+        entity.grid = grid
+        for column, value in values:
+            columns[column][index] = value
+        self.entities.append(entity)
+        self.count += 1
+        self._views = None
+
+    def remove(self, entity):
+        """Take `entity` out, moving the last row into its place"""
+        index = entity.index
+        fields = column_fields(type(entity))
+        values = [(name, getattr(entity, name)) for name, _ in fields]
+        last = self.count - 1
+        if index != last:
+            moved = self.entities[last]
+            for column in self.columns.values():
+                column[index] = column[last]
+            self.entities[index] = moved
+            moved.index = index
+        self.entities.pop()
+        self.count = last
+        self._views = None
+        entity.store = None
+        entity.index = -1
+        entity.grid = None
+        for name, value in values:
+            setattr(entity, name, value)
+
+    def clear(self):
+        """Remove every entity"""
+        for entity in list(self.entities):
+            self.remove(entity)
+
+    def snapshot(self):
+        """Remember every entity's pixel position as where the coming step starts from"""
+        count = self.count
+        columns = self.columns
+        columns["prev_x"][:count] = columns["rect_x"][:count]
+        columns["prev_y"][:count] = columns["rect_y"][:count]
+
+    def interpolated(self, alpha):
+        """Pixel positions `alpha` of the way from the last step's start to its end, as (xs, ys) lists by row"""
+        count = self.count
+        columns = self.columns
+        prev_x, prev_y = columns["prev_x"][:count], columns["prev_y"][:count]
+        xs = prev_x + (columns["rect_x"][:count] - prev_x) * alpha
+        ys = prev_y + (columns["rect_y"][:count] - prev_y) * alpha
+        return xs.tolist(), ys.tolist()
+
+    def update(self):
+        """Advance every entity one frame: patrol, cooldown, bob and animation systems.
+
+        Rows of entities without a component hold zero steps for it, so most
+        systems run over whole columns without selecting rows first.
+        """
+        count = self.count
+        if not count:
+            return
+        c = self._views
+        if c is None:
+            c = self._views = {name: column[:count] for name, column in self.columns.items()}
+        alive = c["alive"]
+
+        # Patrol: walk, turning around past the patrol range
+        walking = c["patrol"] & alive
+        x, vel_x = c["x"], c["vel_x"]
+        x += vel_x * walking
+        turning = walking & (np.abs(x - c["origin_x"]) > c["patrol_range"])
+        np.negative(vel_x, out=vel_x, where=turning)
+
+        # Attack cooldown (skipped while no entity is cooling down)
+        cooldown = c["cooldown"]
+        redraw = None
+        if cooldown.any():
+            cooling = alive & (cooldown > 0)
+            cooldown -= cooling
+            redraw = cooling & (cooldown == 0)
+
+        # Bob around origin_y
+        bob_t, y = c["bob_t"], c["y"]
+        bob_t += c["bob_step"]
+        np.copyto(y, c["origin_y"] + np.sin(bob_t * c["bob_scale"]) * c["bob_amp"], where=c["bob"])
+
+        # Animation frames (whole numbers kept in floats, so the maths is exact)
+        anim_t, period = c["anim_t"], c["anim_period"]
+        anim_t += c["anim_step"]
+        np.remainder(anim_t, period, out=anim_t)
+        frame = np.floor(anim_t) * c["anim_frames"] // period
+        changed = frame != c["frame"]
+        redraw = changed if redraw is None else redraw | changed
+        c["frame"][:] = frame
+
+        # Push changed pixel positions to the rects and re-bucket entities that changed cells
+        rect_x = round_half_away(x)
+        rect_y = round_half_away(y)
+        moved = ((rect_x != c["rect_x"]) | (rect_y != c["rect_y"])).nonzero()[0]
+        if not len(moved) and not redraw.any():
+            return
+        c["rect_x"][:] = rect_x
+        c["rect_y"][:] = rect_y
+        cell0 = rect_x // self.cell_size
+        cell1 = (rect_x + c["width"] - 1) // self.cell_size
+        recell = (cell0 != c["cell0"]) | (cell1 != c["cell1"])
+        c["cell0"][:] = cell0
+        c["cell1"][:] = cell1
+
+        entities = self.entities
+        for index, left, top in zip(moved.tolist(), rect_x[moved].tolist(), rect_y[moved].tolist()):
+            entities[index].rect.topleft = (left, top)
+        for index in recell.nonzero()[0].tolist():
+            entity = entities[index]
+            if entity.grid is not None:
+                entity.grid.move(entity)
+        for index in redraw.nonzero()[0].tolist():
+            entities[index].update_image()
@@ -2,24 +2,72 @@
 import pygame
 from constants import *
 
+# One shared font and pre-rendered numbers keyed by (damage, color)
+_DAMAGE_FONT = None
+_DAMAGE_CACHE = {}
+
+def get_damage_surface(damage, color=RED):
+    """Return the rendered surface for a damage number, rendering each (damage, color) once"""
+    global _DAMAGE_FONT
+    key = (damage, color)
+    surf = _DAMAGE_CACHE.get(key)
+    if surf is None:
+        if _DAMAGE_FONT is None:
+            _DAMAGE_FONT = pygame.font.Font(None, 36)
+        surf = _DAMAGE_FONT.render(str(damage), True, color)
+        _DAMAGE_CACHE[key] = surf
+    return surf
+
 class DamageText(pygame.sprite.Sprite):
-    def __init__(self, x, y, damage):
+    def __init__(self, x, y, damage, color=RED, pool=None):
         super().__init__()
+        self.pool = pool
+        self.reset(x, y, damage, color)
+
+    def reset(self, x, y, damage, color=RED):
+        """(Re)start the effect; pooled instances are reset instead of rebuilt"""
         self.x = x
         self.y = y
         self.damage = damage
         self.lifetime = 60  # frames
-        
-        # Create text surface
-        font = pygame.font.Font(None, 36)
-        self.image = font.render(str(damage), True, RED)
+
+        # Shared, pre-rendered text surface
+        self.image = get_damage_surface(damage, color)
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
-    
+
     def update(self):
         self.lifetime -= 1
         # Float upward
         self.rect.y -= 2
-        
+
         if self.lifetime <= 0:
             self.kill()
+            if self.pool is not None:
+                self.pool.release(self)
+
+class DamageTextPool:
+    """Recycles DamageText sprites so hits don't construct new ones"""
+    def __init__(self, max_size=64):
+        self.max_size = max_size
+        self.free = []
+
+    def acquire(self, x, y, damage, color=RED):
+        """Return a ready-to-add DamageText, reusing a finished one if available"""
+        if self.free:
+            effect = self.free.pop()
+            effect.reset(x, y, damage, color)
+            return effect
+        return DamageText(x, y, damage, color, pool=self)
+
+    def release(self, effect):
+        """Give a finished effect back to the pool"""
+        if len(self.free) < self.max_size:
+            self.free.append(effect)
+
+    def release_all(self, group):
+        """Take this pool's live effects out of `group` and give them back"""
+        for effect in group.sprites():
+            if isinstance(effect, DamageText) and effect.pool is self:
+                effect.kill()
+                self.release(effect)
@@ -110,7 +110,7 @@ class Enemy(pygame.sprite.Sprite):
         weapon_info = WEAPONS[self.weapon]
         weapon_color = weapon_info.get("color", (200,200,200))
 
-        surf = get_weapon_surface(self.weapon, weapon_color, scale=2)
+        surf = get_weapon_surface(self.weapon, weapon_color, scale=2, facing=self.facing)
         sx, sy = surf.get_size()
 
         weapon_y = self.rect.top + (PLAYER_HEIGHT // 2 - sy // 2)
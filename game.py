@@ -7,15 +7,28 @@ from player import Player
 from enemy import Enemy
 from ui import UIManager
 from map import Map
+from effects import DamageTextPool
+from profiler import PROFILER
 
 class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Ultimate Rumble")
+    def __init__(self, headless=False, dirty_rects=False):
+        # Headless games never open a window; they are stepped with simulate()
+        self.headless = headless
+        # Dirty-rect rendering: skip unchanged screens, update only changed regions
+        self.dirty_rects = dirty_rects
+        self.last_view = None
+        self.prev_dirty = []
+        if headless:
+            self.screen = None
+            self.ui = None
+        else:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("Ultimate Rumble")
+            self.ui = UIManager()
         self.clock = pygame.time.Clock()
         self.running = True
         self.state = "menu"  # menu, mode_select, difficulty_select, map_select, weapon_select, color_select, playing, game_over
-        self.ui = UIManager()
+        self.game_over_winner = None
         
         # Game settings
         self.game_mode = None
@@ -40,8 +53,10 @@ class Game:
         # Game objects
         self.player = None
         self.enemy = None
+        self.damage_dealt = {"player": 0, "enemy": 0}
         self.all_sprites = pygame.sprite.Group()
         self.effects = pygame.sprite.Group()
+        self.damage_texts = DamageTextPool()
 
         # Story mode state
         self.story = STORY
@@ -53,6 +68,12 @@ class Game:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                # Window contents were lost; force a full redraw
+                self.last_view = None
+            elif PROFILER.handle_event(event):
+                # The overlay was toggled; repaint whatever it covered
+                self.last_view = None
             elif event.type == pygame.KEYDOWN:
                 if self.state == "menu":
                     if event.key == pygame.K_1:
@@ -124,6 +145,7 @@ class Game:
                             # prepare player and enter story state
                             player_health = self.difficulty_config["player_health"]
                             self.all_sprites.empty()
+                            self.damage_texts.release_all(self.effects)
                             self.effects.empty()
                             self.player = Player(SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2, self.player_weapon, player_health, self.player_color)
                             self.all_sprites.add(self.player)
@@ -179,19 +201,28 @@ class Game:
             if keys[pygame.K_SPACE]:
                 self.player.is_attacking = True
     
-    def start_game(self):
+    def start_game(self, enemy_weapon=None, player_ai=False):
         # Clear old sprites
         self.all_sprites.empty()
+        self.damage_texts.release_all(self.effects)
         self.effects.empty()
         
         self.state = "playing"
+        self.damage_dealt = {"player": 0, "enemy": 0}
         
         # Create player with selected weapon and color
         player_health = self.difficulty_config["player_health"]
-        self.player = Player(SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2, self.player_weapon, player_health, self.player_color)
+        if player_ai:
+            # AI-controlled player for balance runs; an Enemy with neutral stats
+            self.player = Enemy(SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2, self.player_weapon, player_health,
+                                PLAYER_SPEED, ENEMY_AI_UPDATE_FREQ, 1.0, self.player_color)
+            self.player.facing = 1
+        else:
+            self.player = Player(SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2, self.player_weapon, player_health, self.player_color)
         
         # Get random weapon and color for enemy (randomized)
-        enemy_weapon = random.choice(list(WEAPONS.keys()))
+        if enemy_weapon is None:
+            enemy_weapon = random.choice(list(WEAPONS.keys()))
         enemy_color = random.choice([RED, ORANGE, DARK_RED, PINK, GOLD, YELLOW])
         
         # Create enemy with difficulty settings
@@ -237,7 +268,7 @@ class Game:
         if self.story_node_index >= len(self.story):
             # nothing left
             self.state = "game_over"
-            self.ui.game_over_winner = "Player"
+            self.game_over_winner = "Player"
             return
 
         node = self.story[self.story_node_index]
@@ -269,7 +300,7 @@ class Game:
         self.story_dialogue_index = 0
         if self.story_node_index >= len(self.story):
             self.state = "game_over"
-            self.ui.game_over_winner = "Player"
+            self.game_over_winner = "Player"
         else:
             # show next node's first dialogue and map
             next_node = self.story[self.story_node_index]
@@ -309,7 +340,8 @@ class Game:
             self.effects.update()
             
             # Check collisions
-            self.check_collisions()
+            with PROFILER.scope("collisions"):
+                self.check_collisions()
             
             # Reset attack flags after collision check
             if self.player:
@@ -320,7 +352,7 @@ class Game:
             # Check if player is dead
             if self.player.health <= 0:
                 self.state = "game_over"
-                self.ui.game_over_winner = "Enemy"
+                self.game_over_winner = "Enemy"
             # Check if enemy is dead
             elif self.enemy.health <= 0:
                 # remove enemy sprite from groups
@@ -342,7 +374,7 @@ class Game:
                     self.story_dialogue_index = 0
                     if self.story_node_index >= len(self.story):
                         self.state = "game_over"
-                        self.ui.game_over_winner = "Player"
+                        self.game_over_winner = "Player"
                     else:
                         # set map for next node
                         next_node = self.story[self.story_node_index]
@@ -353,7 +385,7 @@ class Game:
                 else:
                     # End game in other modes
                     self.state = "game_over"
-                    self.ui.game_over_winner = "Player"
+                    self.game_over_winner = "Player"
     
     def check_collisions(self):
         # Check attack collisions for player
@@ -362,6 +394,7 @@ class Game:
             if distance < 150 and self.player.attack_cooldown <= 0:  # Attack range
                 damage = self.player.get_weapon_damage()
                 self.enemy.take_damage(damage)
+                self.damage_dealt["player"] += damage
                 self.player.attack_cooldown = 30  # Cooldown frames
                 
                 # Create hit effect
@@ -375,6 +408,7 @@ class Game:
             if distance < 150 and self.enemy.attack_cooldown <= 0:
                 damage = self.enemy.get_weapon_damage()
                 self.player.take_damage(damage)
+                self.damage_dealt["enemy"] += damage
                 self.enemy.attack_cooldown = 30  # Cooldown frames
                 
                 # Create hit effect
@@ -384,13 +418,79 @@ class Game:
     
     def create_hit_effect(self, x, y, damage):
         """Create a visual effect for a hit"""
-        from effects import DamageText
-        effect = DamageText(x, y, damage)
-        self.effects.add(effect)
+        if self.headless:
+            return
+        self.effects.add(self.damage_texts.acquire(x, y, damage))
     
     def draw(self):
+        if self.dirty_rects:
+            self.draw_dirty()
+            return
+        
         self.screen.fill(BG_COLOR)
+        self.draw_state()
+        PROFILER.present(self.screen)
+    
+    def get_view_key(self):
+        """Everything a non-playing screen depends on, to detect when it needs a redraw"""
+        return (self.state, self.game_mode, self.difficulty, self.selected_map_index,
+                self.selected_weapon_index, self.selected_color_index, self.story_node_index,
+                self.story_dialogue_index, self.current_map.map_name if self.current_map else None,
+                self.game_over_winner, self.enemies_defeated)
+    
+    def draw_dirty(self):
+        """Dirty-rectangle renderer (opt-in via Game(dirty_rects=True)).
+        Static screens are only redrawn when their view key changes. While
+        playing, the previous frame's rects are restored from the map
+        background and only changed regions are pushed to the display.
+        """
+        view = self.get_view_key()
+        if self.state != "playing":
+            if view != self.last_view:
+                self.last_view = view
+                self.screen.fill(BG_COLOR)
+                self.draw_state()
+                PROFILER.present(self.screen)
+            elif PROFILER.overlay_visible:
+                PROFILER.present(self.screen, [])
+            return
         
+        background = self.current_map.get_background(self.screen)
+        if view != self.last_view:
+            # Entering play (or a new wave): one full frame
+            self.last_view = view
+            self.screen.blit(background, (0, 0))
+            rects = self.draw_playing()
+            PROFILER.present(self.screen)
+        else:
+            for rect in self.prev_dirty:
+                self.screen.blit(background, rect, rect)
+            rects = self.draw_playing()
+            PROFILER.present(self.screen, self.prev_dirty + rects)
+        self.prev_dirty = rects
+    
+    def draw_playing(self):
+        """Draw fighters, weapons, effects and HUD over the map; returns the rects drawn"""
+        self.all_sprites.draw(self.screen)
+        rects = [sprite.rect.copy() for sprite in self.all_sprites]
+        # Draw weapon overlays (surfaces come pre-mirrored for the fighter's facing)
+        if self.player:
+            info = self.player.get_weapon_draw_info()
+            if info:
+                surf, rect, facing = info
+                rects.append(self.screen.blit(surf, rect.topleft))
+        if self.enemy:
+            info = self.enemy.get_weapon_draw_info()
+            if info:
+                surf, rect, facing = info
+                rects.append(self.screen.blit(surf, rect.topleft))
+        self.effects.draw(self.screen)
+        rects.extend(effect.rect.copy() for effect in self.effects)
+        rects.extend(self.ui.draw_game_ui(self.screen, self.player, self.enemy, self.game_mode, self.difficulty, self.current_level, self.enemies_defeated, self.current_map.display_name))
+        return rects
+    
+    def draw_state(self):
+        """Draw the screen for the current state"""
         if self.state == "menu":
             self.ui.draw_menu(self.screen)
         elif self.state == "mode_select":
@@ -405,26 +505,7 @@ class Game:
             self.ui.draw_color_select(self.screen, self.player_color_list, self.selected_color_index)
         elif self.state == "playing":
             self.current_map.draw(self.screen)
-            self.all_sprites.draw(self.screen)
-            # Draw weapon overlays (use surfaces so they look like weapons)
-            if self.player:
-                info = self.player.get_weapon_draw_info()
-                if info:
-                    surf, rect, facing = info
-                    draw_surf = surf
-                    if facing == -1:
-                        draw_surf = pygame.transform.flip(surf, True, False)
-                    self.screen.blit(draw_surf, rect.topleft)
-            if self.enemy:
-                info = self.enemy.get_weapon_draw_info()
-                if info:
-                    surf, rect, facing = info
-                    draw_surf = surf
-                    if facing == -1:
-                        draw_surf = pygame.transform.flip(surf, True, False)
-                    self.screen.blit(draw_surf, rect.topleft)
-            self.effects.draw(self.screen)
-            self.ui.draw_game_ui(self.screen, self.player, self.enemy, self.game_mode, self.difficulty, self.current_level, self.enemies_defeated, self.current_map.display_name)
+            self.draw_playing()
         elif self.state == "story":
             # Draw map and player, then show story dialog box
             if self.current_map:
@@ -449,15 +530,33 @@ class Game:
                     # nothing to show
                     pass
         elif self.state == "game_over":
-            self.ui.draw_game_over(self.screen, self.ui.game_over_winner, self.game_mode, self.difficulty, self.enemies_defeated)
+            self.ui.draw_game_over(self.screen, self.game_over_winner, self.game_mode, self.difficulty, self.enemies_defeated)
         elif self.state == "options":
             self.ui.draw_options(self.screen)
-        
-        pygame.display.flip()
     
+    def simulate(self, max_frames):
+        """Advance the current match without events or rendering.
+        Returns the number of simulation steps taken.
+        """
+        frames = 0
+        while self.running and self.state == "playing" and frames < max_frames:
+            self.update()
+            frames += 1
+        return frames
+
     def run(self):
+        # Fixed timestep: game logic always advances in FIXED_DT steps,
+        # however long the last frame took to render
+        accumulator = 0.0
         while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
+            accumulator += min(self.clock.tick(FPS) / 1000.0, MAX_FRAME_TIME)
+            PROFILER.begin_frame()
+            with PROFILER.scope("events"):
+                self.handle_events()
+            with PROFILER.scope("update"):
+                while accumulator >= FIXED_DT:
+                    self.update()
+                    accumulator -= FIXED_DT
+            with PROFILER.scope("draw"):
+                self.draw()
+            PROFILER.end_frame()
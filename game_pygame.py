@@ -2,6 +2,7 @@ import pygame
 import random
 import sys
 from enum import Enum
+from profiler import PROFILER
 
 # Initialize Pygame
 pygame.init()
@@ -617,7 +618,7 @@ class SurvivalGame:
         elif self.state == GameState.MENU:
             self.draw_travel_screen()
         
-        pygame.display.flip()
+        PROFILER.present(self.screen)
     
     def draw_eating_screen(self):
         self.screen.fill(DARK_GRAY)
@@ -662,12 +663,17 @@ class SurvivalGame:
     
     def run(self):
         while self.running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                self.handle_input(event)
+            PROFILER.begin_frame()
+            with PROFILER.scope("events"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.running = False
+                    elif not PROFILER.handle_event(event):
+                        self.handle_input(event)
             
-            self.draw()
+            with PROFILER.scope("draw"):
+                self.draw()
+            PROFILER.end_frame()
             self.clock.tick(FPS)
         
         pygame.quit()
@@ -0,0 +1,371 @@
+"""Seeded procedural level generator for quest_madness.
+
+Layouts use the same row format as the levels/level_<n>.json templates and
+are produced one chunk at a time, so a level of any length (or an endless
+run) can be generated lazily ahead of the camera. Every jump between
+consecutive footholds is checked against a JumpModel built from the
+player's physics before it is emitted; check_reachable() re-validates a
+whole template.
+
+Usage: python level_gen.py --seed 7 --width 100000
+"""
+import argparse
+import bisect
+import math
+import random
+import time
+
+CHUNK_WIDTH = 1200
+GROUND_Y = 650
+MIN_TOP = 200  # Highest a generated platform may sit (smaller y = higher)
+MAX_TOP = 600  # Lowest a generated platform may sit
+SPIKE_Y = 600
+PLATFORM_HEIGHT = 40
+WALL_WIDTH = 40
+CHECKPOINT_SPACING = 1000
+LANDING_MARGIN = 10  # Spare height needed above a platform top to land on it
+MIN_WALL_GAIN = 24  # Height each wall jump must gain for a shaft to be climbable
+FALL_LIMIT = 800  # How far below take-off the jump arc is traced
+
+# Platform row styles (index into (theme['platform'], theme['platform_light']))
+STYLE_NORMAL = 0
+STYLE_LIGHT = 1
+
+
+class JumpModel:
+    """Jump envelope of the player: how high a jump is after t frames, and
+    which gaps, rises and wall shafts that makes reachable.
+    """
+
+    def __init__(self, jump_power=-12, gravity=0.5, move_speed=5, player_width=30, player_height=40):
+        self.move_speed = move_speed
+        self.player_width = player_width
+        self.player_height = player_height
+
+        # heights[t]: height above take-off after t frames, integrated like
+        # Player.update (the rect keeps integer coordinates, rounding halves up)
+        heights = [0]
+        vel_y = jump_power
+        y = 0
+        while y < FALL_LIMIT:
+            vel_y += gravity
+            y = math.floor(y + vel_y + 0.5)
+            heights.append(-y)
+        self.heights = heights
+
+        # best[t]: the highest the player can still be at frame t or later
+        best = heights[:]
+        for t in range(len(best) - 2, -1, -1):
+            best[t] = max(best[t], best[t + 1])
+        self.best = best
+        self.max_rise = best[0]
+        self.max_reach = (len(best) - 1) * move_speed
+
+    @classmethod
+    def from_player(cls, player):
+        return cls(player.jump_power, player.gravity, player.move_speed, player.width, player.height)
+
+    def frames_to_cover(self, distance):
+        return max(0, math.ceil(distance / self.move_speed))
+
+    def can_jump(self, gap, rise, margin=LANDING_MARGIN):
+        """Can the player clear a horizontal `gap` and land `rise` px higher (negative = lower)?"""
+        t = self.frames_to_cover(gap)
+        return t < len(self.best) and self.best[t] >= rise + margin
+
+    def max_gap(self, rise):
+        """Widest gap that still lands `rise` px higher, or -1 if the rise is out of reach"""
+        t = len(self.best) - 1
+        while t >= 0 and self.best[t] < rise + LANDING_MARGIN:
+            t -= 1
+        return t * self.move_speed if t >= 0 else -1
+
+    def _cross_frames(self, distance):
+        # A wall jump kicks off at twice the run speed for one frame
+        return 1 + self.frames_to_cover(distance - self.move_speed * 2)
+
+    def can_climb(self, shaft):
+        """Can the player climb a shaft `shaft` px wide by wall jumping between its walls?"""
+        if shaft < self.player_width + 10:
+            return False
+        # The player crosses shaft - width px, but may sink up to its own
+        # width into the far wall before catching on it
+        first = self._cross_frames(shaft - self.player_width)
+        last = self._cross_frames(shaft)
+        if last >= len(self.heights):
+            return False
+        return min(self.heights[first:last + 1]) >= MIN_WALL_GAIN
+
+
+def new_rows():
+    return {"platforms": [], "spikes": [], "checkpoints": [], "coins": [],
+            "collectibles": [], "enemies": []}
+
+
+class LevelGenerator:
+    """Generates a level chunk by chunk from a seed.
+
+    Chunks come out in order from next_chunk() and the same seed always
+    yields the same layout. Each chunk holds the objects of the segments
+    that start inside it; they span from the chunk's "x" to its "end".
+    generate() builds a whole fixed-length level with a goal at the end.
+    """
+
+    def __init__(self, seed=0, model=None):
+        self.rng = random.Random(seed)
+        self.model = model or JumpModel()
+        self.chunk_index = 0
+        self.cursor_x = 0  # Right edge of the last foothold...
+        self.cursor_top = GROUND_Y  # ...and the top the player jumps from
+        self.clear_x = 0  # Nothing new may start left of this
+        self.next_checkpoint_x = CHECKPOINT_SPACING
+        self.checkpoint_id = 0
+
+    def next_chunk(self):
+        """Generate the next CHUNK_WIDTH slice; returns a rows dict with its index and extent"""
+        rows = new_rows()
+        start = self.chunk_index * CHUNK_WIDTH
+        end = start + CHUNK_WIDTH
+        if self.chunk_index == 0:
+            # Spawn ground under Player(100, 600)
+            rows["platforms"].append([0, GROUND_Y, 250, 50, STYLE_NORMAL, 0])
+            self.cursor_x = self.clear_x = 250
+
+        while self.cursor_x < end:
+            roll = self.rng.random()
+            if roll < 0.15:
+                self._shaft(rows)
+            elif roll < 0.3:
+                self._moving(rows)
+            else:
+                self._hop(rows, spikes=roll < 0.5)
+
+        rows["index"] = self.chunk_index
+        rows["x"] = start
+        rows["end"] = self.clear_x  # Nothing in this chunk extends past here
+        self.chunk_index += 1
+        return rows
+
+    def generate(self, width, name="Generated"):
+        """Generate a complete level about `width` px long, ending at a goal"""
+        template = new_rows()
+        while self.cursor_x < width - 500:
+            chunk = self.next_chunk()
+            for key, values in template.items():
+                values.extend(chunk[key])
+        # Wide landing with the goal above it
+        gap, top = self._pick_link(max(40, self.clear_x - self.cursor_x))
+        x = self.cursor_x + gap
+        template["platforms"].append([x, top, 300, PLATFORM_HEIGHT, STYLE_NORMAL, 0])
+        template["goal"] = [x + 200, top - 100]
+        template["name"] = name
+        template["width"] = x + 400
+        return template
+
+    def _pick_link(self, min_gap, extra=0):
+        """Choose (gap, top) for the next foothold, or None if it can't be reached.
+
+        `extra` is added worst-case distance (e.g. a moving platform's range).
+        """
+        model = self.model
+        rng = self.rng
+        for _ in range(12):
+            top = self.cursor_top - rng.randint(-160, int(model.max_rise * 0.75))
+            top = min(MAX_TOP, max(MIN_TOP, top))
+            limit = model.max_gap(self.cursor_top - top) - extra
+            if limit >= min_gap:
+                return rng.randint(min_gap, max(min_gap, int(limit * 0.85))), top
+        # Dropping as low as allowed gives the longest reach
+        if model.can_jump(min_gap + extra, self.cursor_top - MAX_TOP):
+            return min_gap, MAX_TOP
+        return None
+
+    def _add_checkpoint(self, rows, x, top, width):
+        if x < self.next_checkpoint_x:
+            return False
+        self.checkpoint_id += 1
+        rows["checkpoints"].append([x + width // 2, top - 20, self.checkpoint_id])
+        self.next_checkpoint_x = x + CHECKPOINT_SPACING
+        return True
+
+    def _advance(self, right, top, clear_x=None):
+        self.cursor_x = right
+        self.cursor_top = top
+        self.clear_x = right if clear_x is None else clear_x
+
+    def _hop(self, rows, spikes=False):
+        """A static platform one jump away, with coins, maybe an enemy and spikes below the gap"""
+        rng = self.rng
+        gap, top = self._pick_link(max(40, self.clear_x - self.cursor_x))
+        x = self.cursor_x + gap
+        width = rng.randint(100, 220)
+        rows["platforms"].append([x, top, width, PLATFORM_HEIGHT, STYLE_NORMAL, 0])
+
+        # Spikes only where the whole jump passes above them
+        if spikes and gap >= 60 and max(self.cursor_top, top) <= SPIKE_Y - 10:
+            for spike_x in range(self.cursor_x + 10, x - 20, 45):
+                rows["spikes"].append([spike_x, SPIKE_Y])
+        if rng.random() < 0.2:
+            rows["collectibles"].append([self.cursor_x + gap // 2, min(self.cursor_top, top) - 70])
+
+        has_checkpoint = self._add_checkpoint(rows, x, top, width)
+        if rng.random() < 0.6:
+            count = rng.randint(1, 3)
+            for i in range(count):
+                rows["coins"].append([x + (i + 1) * width // (count + 1), top - 25])
+        if not has_checkpoint and width >= 150 and rng.random() < 0.35:
+            rows["enemies"].append([x + width // 2 - 12, top - 25, min(80, (width - 25) // 2 - 4)])
+
+        self._advance(x + width, top)
+
+    def _moving(self, rows):
+        """A platform sliding back and forth; both jumps are checked at its worst position"""
+        rng = self.rng
+        move_range = rng.randint(40, 70)
+        reach = move_range + 2  # Platform.update overshoots the range by one step
+        link = self._pick_link(max(self.clear_x - self.cursor_x, 30) + reach, extra=reach)
+        if link is None:
+            self._hop(rows)
+            return
+        gap, top = link
+        x = self.cursor_x + gap
+        width = rng.randint(100, 140)
+        rows["platforms"].append([x, top, width, PLATFORM_HEIGHT, STYLE_LIGHT, move_range])
+        if rng.random() < 0.5:
+            rows["coins"].append([x + width // 2, top - 25])
+        # Jump off from its leftmost position, but keep clear of its rightmost
+        self._advance(x - reach + width, top, clear_x=x + reach + width + 20)
+
+    def _shaft(self, rows):
+        """Two walls that can only be passed by wall jumping up between them"""
+        rng = self.rng
+        model = self.model
+        shaft = rng.randint(70, 130)
+        link = self._pick_link(max(40, self.clear_x - self.cursor_x))
+        if link is None:
+            self._hop(rows)
+            return
+        gap, top = link
+        height = min(rng.randint(150, 240), top - 100)
+        if height < 150 or not model.can_climb(shaft):
+            self._hop(rows)
+            return
+
+        # Floor runs under the left wall (raised so the player can walk in) up to the right wall
+        x = self.cursor_x + gap
+        left = x + 60
+        right = left + WALL_WIDTH + shaft
+        rows["platforms"].append([x, top, right + WALL_WIDTH - x, PLATFORM_HEIGHT, STYLE_NORMAL, 0])
+        rows["platforms"].append([left, top - height, WALL_WIDTH, height - 60, STYLE_LIGHT, 0])
+        rows["platforms"].append([right, top - height, WALL_WIDTH, height, STYLE_LIGHT, 0])
+        for i in (1, 2):
+            rows["coins"].append([left + WALL_WIDTH + shaft // 2, top - height * i // 3])
+        self._add_checkpoint(rows, x, top, 60)
+
+        # Continue from the top of the right wall
+        self._advance(right + WALL_WIDTH, top - height)
+
+
+def _extent(row):
+    """(left, right) a platform row can occupy, including its movement range"""
+    x, y, width, height, style, move_range = row
+    reach = move_range + 2 if move_range else 0
+    return x - reach, x + width + reach
+
+
+def _is_climbable_pair(model, first, second):
+    """Are two walls facing each other across a climbable shaft?"""
+    for wall in (first, second):
+        if wall[5] or wall[3] <= wall[2]:
+            return False  # Moving, or wider than tall
+    shaft = second[0] - (first[0] + first[2])
+    overlap = min(first[1] + first[3], second[1] + second[3]) - max(first[1], second[1])
+    return overlap > model.player_height and model.can_climb(shaft)
+
+
+def check_reachable(template, model=None, spawn=(115, 640)):
+    """Flood-fill the platforms reachable from the spawn point.
+
+    Returns a list of (kind, row) for every platform (and the goal) the
+    player cannot reach; an empty list means the layout is valid.
+    """
+    model = model or JumpModel()
+    platforms = sorted(template["platforms"], key=lambda row: _extent(row)[0])
+    lefts = [_extent(row)[0] for row in platforms]
+    widest = max((right - left for left, right in map(_extent, platforms)), default=0)
+
+    # Wall pairs forming shafts, found among nearby tall platforms
+    shafts = []
+    for i, first in enumerate(platforms):
+        for second in platforms[i + 1:bisect.bisect_right(lefts, lefts[i] + 300)]:
+            if _is_climbable_pair(model, first, second):
+                shafts.append((first, second))
+
+    sx, sy = spawn
+    start = [i for i, row in enumerate(platforms)
+             if _extent(row)[0] <= sx <= _extent(row)[1] and row[1] >= sy]
+    if not start:
+        return [("platform", row) for row in platforms]
+    start = min(start, key=lambda i: platforms[i][1])
+
+    reached = {start}
+    stack = [start]
+    while stack:
+        i = stack.pop()
+        row = platforms[i]
+        left, right = _extent(row)
+        top = row[1]
+        lo = bisect.bisect_left(lefts, left - model.max_reach - widest)
+        hi = bisect.bisect_right(lefts, right + model.max_reach)
+        for j in range(lo, hi):
+            if j in reached:
+                continue
+            other = platforms[j]
+            other_left, other_right = _extent(other)
+            gap = max(0, other_left - right, left - other_right)
+            if model.can_jump(gap, top - other[1]):
+                reached.add(j)
+                stack.append(j)
+        # Standing in a shaft lets the player climb to the tops of both walls
+        for first, second in shafts:
+            inner_left = first[0] + first[2]
+            inner_right = second[0]
+            if left < inner_right and right > inner_left and top >= max(first[1], second[1]) \
+                    and top - min(first[1] + first[3], second[1] + second[3]) <= model.max_rise:
+                for wall in (first, second):
+                    j = platforms.index(wall)
+                    if j not in reached:
+                        reached.add(j)
+                        stack.append(j)
+
+    missing = [("platform", row) for i, row in enumerate(platforms) if i not in reached]
+    goal = template.get("goal")
+    if goal:
+        gx, gy = goal
+        # The goal (35x35, centered) only has to be touched, not landed on
+        touched = any(model.can_jump(max(0, gx - 17 - _extent(platforms[i])[1], _extent(platforms[i])[0] - gx - 18),
+                                     platforms[i][1] - (gy + 18 + model.player_height), margin=0)
+                      for i in reached)
+        if not touched:
+            missing.append(("goal", goal))
+    return missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate and validate a quest_madness level")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--width", type=int, default=100000, help="level length in pixels")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    template = LevelGenerator(args.seed).generate(args.width)
+    elapsed = time.perf_counter() - start
+    counts = ", ".join(f"{len(template[key])} {key}" for key in new_rows())
+    print(f"{template['width']}px level in {elapsed * 1000:.0f}ms: {counts}")
+
+    missing = check_reachable(template)
+    print("all reachable" if not missing else f"{len(missing)} unreachable: {missing[:5]}")
+
+
+if __name__ == "__main__":
+    main()
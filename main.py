@@ -1,6 +1,7 @@
 import pygame
 import time
 import sys
+from profiler import PROFILER
 
 # Initialize pygame
 pygame.init()
@@ -43,12 +44,13 @@ def wrap_text(text, max_width):
 
 # Function to render text
 def draw_text(text):
-    screen.fill(BLACK)
-    lines = wrap_text(text, WIDTH - 40)
-    for i, line in enumerate(lines):
-        rendered = font.render(line, True, WHITE)
-        screen.blit(rendered, (20, 20 + i * 30))
-    pygame.display.flip()
+    with PROFILER.scope("draw"):
+        screen.fill(BLACK)
+        lines = wrap_text(text, WIDTH - 40)
+        for i, line in enumerate(lines):
+            rendered = font.render(line, True, WHITE)
+            screen.blit(rendered, (20, 20 + i * 30))
+    PROFILER.present(screen)
 
 # Function to show inventory
 def show_inventory():
@@ -64,23 +66,28 @@ def get_input(prompt):
     draw_text(prompt)
     running = True
     while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                # Show inventory
-                if event.key == pygame.K_i:
-                    show_inventory()
-                    draw_text(prompt + "\n" + user_text)
-                # Submit input
-                elif event.key == pygame.K_RETURN:
-                    running = False
-                elif event.key == pygame.K_BACKSPACE:
-                    user_text = user_text[:-1]
-                else:
-                    user_text += event.unicode
+        PROFILER.begin_frame()
+        with PROFILER.scope("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if PROFILER.handle_event(event):
+                    continue
+                if event.type == pygame.KEYDOWN:
+                    # Show inventory
+                    if event.key == pygame.K_i:
+                        show_inventory()
+                        draw_text(prompt + "\n" + user_text)
+                    # Submit input
+                    elif event.key == pygame.K_RETURN:
+                        running = False
+                    elif event.key == pygame.K_BACKSPACE:
+                        user_text = user_text[:-1]
+                    else:
+                        user_text += event.unicode
         draw_text(prompt + "\n" + user_text)
+        PROFILER.end_frame()
         clock.tick(60)
     return user_text.lower()
 
@@ -88,14 +95,19 @@ def get_input(prompt):
 def pause_text(text, seconds=2):
     start = time.time()
     while time.time() - start < seconds:
+        PROFILER.begin_frame()
         draw_text(text)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_i:
-                show_inventory()
-                draw_text(text)
+        with PROFILER.scope("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if PROFILER.handle_event(event):
+                    continue
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_i:
+                    show_inventory()
+                    draw_text(text)
+        PROFILER.end_frame()
         clock.tick(60)
 
 # Menu START
@@ -106,6 +118,8 @@ while waiting:
         if event.type == pygame.QUIT:
             pygame.quit()
             sys.exit()
+        if PROFILER.handle_event(event):
+            continue
         if event.type == pygame.KEYDOWN:
             waiting = False
             pause_text("Get ready to start your adventure!", 2)
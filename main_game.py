@@ -5,7 +5,7 @@ from game import Game
 
 def main():
     pygame.init()
-    game = Game()
+    game = Game(dirty_rects="--dirty-rects" in sys.argv)
     game.run()
     pygame.quit()
     sys.exit()
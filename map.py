@@ -2,6 +2,9 @@
 import pygame
 from constants import *
 
+# Pre-rendered backgrounds keyed by (map_name, screen size)
+_BACKGROUND_CACHE = {}
+
 class Map:
     def __init__(self, map_name):
         self.map_name = map_name
@@ -16,6 +19,23 @@ class Map:
     
     def draw(self, screen):
         """Draw the map background and decorations"""
+        screen.blit(self.get_background(screen), (0, 0))
+
+    def get_background(self, screen):
+        """Return the cached background for this map, rendering it on first use.
+        The cache is keyed by screen size, so a resized screen gets a fresh render.
+        """
+        key = (self.map_name, screen.get_size())
+        background = _BACKGROUND_CACHE.get(key)
+        if background is None:
+            # Match the screen's pixel format so the per-frame blit is a plain copy
+            background = pygame.Surface(screen.get_size(), 0, screen)
+            self.render_background(background)
+            _BACKGROUND_CACHE[key] = background
+        return background
+
+    def render_background(self, screen):
+        """Render the full background and decorations onto `screen`"""
         # Draw background
         screen.fill(self.bg_color)
         
@@ -85,3 +105,8 @@ class Map:
         # Draw towers
         pygame.draw.rect(screen, (80, 80, 100), (150, 100, 80, 300))
         pygame.draw.rect(screen, (80, 80, 100), (SCREEN_WIDTH - 230, 100, 80, 300))
+
+
+def clear_background_cache():
+    """Drop all pre-rendered map backgrounds (e.g. after the display mode changes)"""
+    _BACKGROUND_CACHE.clear()
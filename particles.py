@@ -0,0 +1,141 @@
+"""Structure-of-arrays particle engine backed by NumPy"""
+import math
+import numpy as np
+
+PARTICLE_SIZE = 5
+PARTICLE_GRAVITY = 0.2
+
+_EVEN_BYTES = np.uint32(0x00FF00FF)
+
+
+class ParticleSystem:
+    """Every live particle stored in parallel arrays (position, velocity,
+    lifetime, color). Physics, fading and culling run as whole-array
+    operations and drawing blends all particles into the target in one batch.
+    """
+
+    def __init__(self, capacity=1024, gravity=PARTICLE_GRAVITY, size=PARTICLE_SIZE, rng=None, seed=None):
+        self.gravity = gravity
+        self.size = size
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), np.float32)
+        self.vel = np.zeros((capacity, 2), np.float32)
+        self.life = np.zeros(capacity, np.float32)
+        self.max_life = np.ones(capacity, np.float32)
+        self.color = np.zeros((capacity, 3), np.uint8)
+        # Pixel offsets covering one size x size particle square
+        self._dx = np.tile(np.arange(size), size)
+        self._dy = np.repeat(np.arange(size), size)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self, needed):
+        capacity = len(self.life)
+        while capacity < needed:
+            capacity *= 2
+        for name in ("pos", "vel", "life", "max_life", "color"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def emit(self, x, y, color, count, speed_min, speed_max, lifetime):
+        """Spawn `count` particles at (x, y) flying out in random directions"""
+        start = self.count
+        end = start + count
+        if end > len(self.life):
+            self._grow(end)
+        angle = self.rng.uniform(0, 2 * math.pi, count)
+        speed = self.rng.uniform(speed_min, speed_max, count)
+        self.pos[start:end] = (x, y)
+        self.vel[start:end, 0] = np.cos(angle) * speed
+        self.vel[start:end, 1] = np.sin(angle) * speed
+        self.life[start:end] = lifetime
+        self.max_life[start:end] = lifetime
+        self.color[start:end] = color
+        self.count = end
+
+    def update(self):
+        """Move, apply gravity, age and drop dead particles"""
+        n = self.count
+        if n == 0:
+            return
+        self.pos[:n] += self.vel[:n]
+        self.vel[:n, 1] += self.gravity
+        self.life[:n] -= 1
+
+        alive = self.life[:n] > 0
+        if not alive.all():
+            # Compact survivors to the front of every array
+            keep = np.flatnonzero(alive)
+            m = len(keep)
+            self.pos[:m] = self.pos[keep]
+            self.vel[:m] = self.vel[keep]
+            self.life[:m] = self.life[keep]
+            self.max_life[:m] = self.max_life[keep]
+            self.color[:m] = self.color[keep]
+            self.count = m
+
+    def clear(self):
+        self.count = 0
+
+    def draw(self, surface, camera_x=0):
+        """Alpha-blend every on-screen particle into `surface`, fading with remaining life"""
+        n = self.count
+        if n == 0:
+            return
+        size = self.size
+        width, height = surface.get_size()
+        left = (self.pos[:n, 0] - camera_x).astype(np.intp) - size // 2
+        top = self.pos[:n, 1].astype(np.intp) - size // 2
+        visible = (left > -size) & (left < width) & (top > -size) & (top < height)
+        if not visible.any():
+            return
+        left = left[visible]
+        top = top[visible]
+        color = self.color[:n][visible]
+
+        if surface.get_bytesize() != 4:
+            self._draw_unblended(surface, left, top, color)
+            return
+
+        # Source pixels in the surface's own format, alpha as 0..256 weights
+        shifts = surface.get_shifts()
+        losses = surface.get_losses()
+        rgb = color.astype(np.uint32)
+        src = surface.get_masks()[3]
+        for ch in range(3):
+            src = src | ((rgb[:, ch] >> losses[ch]) << shifts[ch])
+        src = src[:, None]
+        weight = (self.life[:n][visible] / self.max_life[:n][visible] * 256).astype(np.uint32)[:, None]
+
+        # Index of every pixel of every particle square in the flat pixel buffer
+        stride = surface.get_pitch() // 4
+        offsets = self._dy * stride + self._dx
+        index = (top * stride + left)[:, None] + offsets
+        partial = (left < 0) | (left > width - size) | (top < 0) | (top > height - size)
+        if partial.any():
+            xs = left[:, None] + self._dx
+            ys = top[:, None] + self._dy
+            inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+            index = index[inside]
+            src = np.broadcast_to(src, inside.shape)[inside]
+            weight = np.broadcast_to(weight, inside.shape)[inside]
+
+        view = surface.get_view("1")
+        pixels = np.frombuffer(view, np.uint32)
+        dst = pixels.take(index)
+        # Blend two 8-bit channels per 32-bit multiply (even and odd bytes)
+        inverse = 256 - weight
+        even = (((dst & _EVEN_BYTES) * inverse + (src & _EVEN_BYTES) * weight) >> 8) & _EVEN_BYTES
+        odd = (((dst >> 8) & _EVEN_BYTES) * inverse + ((src >> 8) & _EVEN_BYTES) * weight) & ~_EVEN_BYTES
+        pixels.put(index, even | odd)
+        del pixels, view  # release the surface lock
+
+    def _draw_unblended(self, surface, left, top, color):
+        # Fallback for non 32-bit surfaces: solid squares, no fade
+        size = self.size
+        for x, y, c in zip(left.tolist(), top.tolist(), color.tolist()):
+            surface.fill(c, (x, y, size, size))
@@ -76,7 +76,8 @@ class Player(pygame.sprite.Sprite):
 
     def get_weapon_draw_info(self):
         """Return (surface, pygame.Rect, facing) for weapon overlay drawing.
-        The surface is already colored; rect is in screen coordinates.
+        The surface is already colored and mirrored for `facing`; rect is in
+        screen coordinates.
         """
         if self.weapon not in WEAPONS:
             return None
@@ -84,8 +85,8 @@ class Player(pygame.sprite.Sprite):
         weapon_info = WEAPONS[self.weapon]
         weapon_color = weapon_info.get("color", (200,200,200))
 
-        # create weapon surface (cached inside weapons.get_weapon_surface)
-        surf = get_weapon_surface(self.weapon, weapon_color, scale=2)
+        # create weapon surface for the current facing (cached inside weapons.get_weapon_surface)
+        surf = get_weapon_surface(self.weapon, weapon_color, scale=2, facing=self.facing)
 
         # compute draw position so weapon appears near player's hand
         sx, sy = surf.get_size()
@@ -0,0 +1,281 @@
+"""Frame-time instrumentation shared by every game loop.
+
+Loops mark each frame with begin_frame()/end_frame() and wrap their phases
+in named scopes:
+
+    PROFILER.begin_frame()
+    with PROFILER.scope("update"):
+        ...
+    PROFILER.end_frame()
+
+Scopes may nest ("collisions" inside "update"); each scope is charged only
+its own time, so the scope times of a frame add up to its busy time. The
+last RING_SIZE frames are kept in a ring buffer with their scope times and
+the net number of memory blocks allocated. F3 toggles an overlay with
+per-scope milliseconds, FPS percentiles and allocation counts; F4 dumps the
+ring buffer to CSV and JSON in PROFILE_DIR.
+"""
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+
+import pygame
+
+RING_SIZE = 600  # Frames kept for the overlay and dumps (10 s at 60 FPS)
+FRAME_BUDGET_MS = 1000 / 60
+OVERLAY_REFRESH = 0.25  # Seconds between overlay redraws
+PROFILE_DIR = "frame_profiles"
+TOGGLE_KEY = pygame.K_F3
+DUMP_KEY = pygame.K_F4
+
+_clock = time.perf_counter
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class _Scope:
+    """Context manager timing one named scope; one instance per name is reused"""
+
+    __slots__ = ("profiler", "name")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._stack.append([self.name, _clock(), 0.0])
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        profiler = self.profiler
+        if not profiler._stack:
+            return False  # A nested loop started a new frame inside this scope
+        name, start, children = profiler._stack.pop()
+        total = _clock() - start
+        scopes = profiler._scopes
+        scopes[name] = scopes.get(name, 0.0) + total - children
+        if profiler._stack:
+            profiler._stack[-1][2] += total
+        return False
+
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class FrameProfiler:
+    """Per-frame scope timings in a ring buffer, with an overlay and CSV/JSON export"""
+
+    def __init__(self, size=RING_SIZE):
+        self.enabled = True
+        self.overlay_visible = False
+        self.frames = deque(maxlen=size)  # (frame, time_s, frame_ms, busy_ms, alloc_blocks, {scope: ms})
+        self.scope_names = []  # Every scope seen, in first-seen order
+        self.frame_count = 0
+        self._scope_objects = {}
+        self._stack = []
+        self._scopes = {}
+        self._frame_start = None
+        self._last_start = None
+        self._open = False
+        self._blocks = 0
+        self._origin = _clock()
+        self._overlay = None
+        self._overlay_time = 0.0
+        self._font = None
+
+    def scope(self, name):
+        """Context manager charging the time spent inside it to `name`"""
+        if not self.enabled:
+            return _NULL_SCOPE
+        scope = self._scope_objects.get(name)
+        if scope is None:
+            scope = self._scope_objects[name] = _Scope(self, name)
+            self.scope_names.append(name)
+        return scope
+
+    def begin_frame(self):
+        """Start a frame; an unfinished previous frame is discarded"""
+        if not self.enabled:
+            return
+        now = _clock()
+        self._last_start, self._frame_start = self._frame_start, now
+        self._open = True
+        self._scopes = {}
+        del self._stack[:]
+        self._blocks = sys.getallocatedblocks()
+
+    def end_frame(self):
+        """Finish the frame and add it to the ring buffer"""
+        if not self.enabled or not self._open:
+            return  # Already ended, e.g. by a nested loop's frames
+        self._open = False
+        now = _clock()
+        start = self._frame_start
+        busy_ms = (now - start) * 1000
+        # The frame period runs from the previous frame's start, so it includes
+        # time spent waiting in clock.tick(); the first frame only has its busy time
+        frame_ms = (start - self._last_start) * 1000 if self._last_start is not None else busy_ms
+        scopes = {name: seconds * 1000 for name, seconds in self._scopes.items()}
+        self.frames.append((self.frame_count, start - self._origin, frame_ms, busy_ms,
+                            sys.getallocatedblocks() - self._blocks, scopes))
+        self.frame_count += 1
+
+    def reset(self):
+        """Forget every recorded frame"""
+        self.frames.clear()
+        self._frame_start = self._last_start = None
+        self._open = False
+        self._overlay = None
+
+    def summary(self):
+        """Statistics over the frames in the ring buffer"""
+        frames = list(self.frames)
+        if not frames:
+            return {"frames": 0}
+        count = len(frames)
+        periods = sorted(f[2] for f in frames)
+        busy = sorted(f[3] for f in frames)
+        allocs = [f[4] for f in frames]
+        scopes = {}
+        for name in self.scope_names:
+            times = [f[5].get(name, 0.0) for f in frames]
+            scopes[name] = {"avg_ms": sum(times) / count, "max_ms": max(times)}
+
+        def fps(ms):
+            return 1000 / ms if ms > 0 else 0.0
+
+        return {
+            "frames": count,
+            "frame_ms": {"avg": sum(periods) / count, "p50": percentile(periods, 50),
+                         "p95": percentile(periods, 95), "p99": percentile(periods, 99),
+                         "max": periods[-1]},
+            "busy_ms": {"avg": sum(busy) / count, "p95": percentile(busy, 95), "max": busy[-1],
+                        "over_budget": sum(1 for ms in busy if ms > FRAME_BUDGET_MS)},
+            # Low FPS percentiles come from the slowest frames
+            "fps": {"avg": fps(sum(periods) / count), "p50": fps(percentile(periods, 50)),
+                    "p5": fps(percentile(periods, 95)), "p1": fps(percentile(periods, 99))},
+            "alloc_blocks": {"avg": sum(allocs) / count, "max": max(allocs),
+                             "live": sys.getallocatedblocks()},
+            "scopes": scopes,
+        }
+
+    # ---- Export ----
+
+    def dump_csv(self, path):
+        """Write one row per buffered frame with a column per scope (ms)"""
+        names = list(self.scope_names)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "time_s", "frame_ms", "busy_ms", "alloc_blocks"] + names)
+            for frame, t, frame_ms, busy_ms, alloc, scopes in self.frames:
+                writer.writerow([frame, f"{t:.4f}", f"{frame_ms:.3f}", f"{busy_ms:.3f}", alloc]
+                                + [f"{scopes.get(name, 0.0):.3f}" for name in names])
+
+    def dump_json(self, path):
+        """Write the summary and every buffered frame as JSON"""
+        frames = [{"frame": frame, "time_s": round(t, 4), "frame_ms": round(frame_ms, 3),
+                   "busy_ms": round(busy_ms, 3), "alloc_blocks": alloc,
+                   "scopes": {name: round(ms, 3) for name, ms in scopes.items()}}
+                  for frame, t, frame_ms, busy_ms, alloc, scopes in self.frames]
+        with open(path, "w") as f:
+            json.dump({"budget_ms": FRAME_BUDGET_MS, "summary": self.summary(), "frames": frames}, f, indent=1)
+
+    def dump(self, directory=PROFILE_DIR):
+        """Dump the ring buffer to timestamped CSV and JSON files; returns their paths"""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"frames_{time.strftime('%Y%m%d-%H%M%S')}")
+        self.dump_csv(base + ".csv")
+        self.dump_json(base + ".json")
+        print(f"Frame profile saved to {base}.csv and {base}.json")
+        return base + ".csv", base + ".json"
+
+    # ---- In-game controls and overlay ----
+
+    def handle_event(self, event):
+        """Handle the profiler keys; returns True if the event was one of them"""
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == TOGGLE_KEY:
+            self.overlay_visible = not self.overlay_visible
+            self._overlay = None
+            return True
+        if event.key == DUMP_KEY:
+            try:
+                self.dump()
+            except OSError as e:
+                print(f"Error saving frame profile: {e}")
+            return True
+        return False
+
+    def overlay_lines(self):
+        stats = self.summary()
+        if not stats["frames"]:
+            return ["profiler: no frames yet"]
+        frame, busy, fps, alloc = stats["frame_ms"], stats["busy_ms"], stats["fps"], stats["alloc_blocks"]
+        lines = [
+            f"FPS avg {fps['avg']:.0f}  p50 {fps['p50']:.0f}  p5 {fps['p5']:.0f}  p1 {fps['p1']:.0f}",
+            f"frame ms p50 {frame['p50']:.1f}  p95 {frame['p95']:.1f}  p99 {frame['p99']:.1f}",
+            f"busy ms avg {busy['avg']:.2f}  max {busy['max']:.2f}  over {FRAME_BUDGET_MS:.1f}: {busy['over_budget']}",
+            f"alloc blocks/frame avg {alloc['avg']:+.0f}  max {alloc['max']:+d}  live {alloc['live']}",
+        ]
+        for name, scope in stats["scopes"].items():
+            lines.append(f"  {name:<11}{scope['avg_ms']:7.2f} ms  max {scope['max_ms']:6.2f}")
+        return lines
+
+    def draw_overlay(self, surface, pos=(8, 8)):
+        """Blit the overlay onto `surface`; returns the rect it covers.
+
+        The text is only re-rendered every OVERLAY_REFRESH seconds so the
+        overlay itself barely shows up in the numbers it reports.
+        """
+        now = _clock()
+        if self._overlay is None or now - self._overlay_time >= OVERLAY_REFRESH:
+            if self._font is None:
+                self._font = pygame.font.Font(None, 20)
+            rendered = [self._font.render(line, True, (230, 230, 230)) for line in self.overlay_lines()]
+            line_height = self._font.get_linesize()
+            width = max(text.get_width() for text in rendered) + 12
+            overlay = pygame.Surface((width, line_height * len(rendered) + 10))
+            overlay.fill((10, 10, 20))
+            for i, text in enumerate(rendered):
+                overlay.blit(text, (6, 5 + i * line_height))
+            self._overlay = overlay
+            self._overlay_time = now
+        return surface.blit(self._overlay, pos)
+
+    def present(self, surface, rects=None):
+        """Draw the overlay when shown, then update the display in the "flip" scope.
+
+        With `rects` only those regions (plus the overlay) are updated.
+        """
+        if self.overlay_visible and surface is not None:
+            overlay_rect = self.draw_overlay(surface)
+            if rects is not None:
+                rects = list(rects) + [overlay_rect]
+        with self.scope("flip"):
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+
+
+PROFILER = FrameProfiler()
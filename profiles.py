@@ -0,0 +1,145 @@
+"""Multi-profile save store: an append-only log with an in-memory index.
+
+Each line of the log is one JSON record {"version", "name", "data",
+"checksum"}, version being the SAVE_VERSION of the data. Loading replays
+the log into a name -> data index, upgrading records from older versions
+and skipping records whose checksum fails (e.g. a line torn by a crash).
+Records written by a newer version of the game are kept in the log as they
+are. Saving a profile updates the
+index at once and appends a single record from a background writer thread,
+so neither lookups nor saves touch the rest of the file. When the log holds
+too many superseded records it is compacted with an atomic rewrite.
+"""
+import json
+import os
+from savefile import SAVE_VERSION, SaveWriter, checksum, upgrade, write_atomic
+
+COMPACT_FACTOR = 4  # Compact once the log holds this many lines per live profile...
+COMPACT_SLACK = 64  # ...plus this many
+
+
+def encode_record(name, data):
+    return json.dumps({"version": SAVE_VERSION, "name": name, "data": data, "checksum": checksum(data)})
+
+
+def decode_record(line):
+    """Return (name, data) for a log line, or None if it is damaged.
+
+    Raises ValueError for a record written by a newer version of the game.
+    """
+    try:
+        record = json.loads(line)
+        # Records from before the log was versioned hold version 2 data
+        version = record.get("version", 2)
+        name, data = record["name"], record["data"]
+        if checksum(data) != record["checksum"]:
+            return None
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+    return name, upgrade(data, version)
+
+
+class ProfileWriter(SaveWriter):
+    """Background writer appending batches of changed profiles to a ProfileStore's log"""
+
+    def __init__(self, store):
+        self.store = store
+        super().__init__(store.path)
+
+    def _merge(self, pending, item):
+        # Keep only the newest snapshot of each profile
+        name, data = item
+        pending = pending or {}
+        pending[name] = dict(data)
+        return pending
+
+    def _write(self, batch):
+        self.store.append(batch)
+
+
+class ProfileStore:
+    """Named profiles with O(1) lookups and per-save appends instead of rewrites"""
+
+    def __init__(self, path):
+        self.path = path
+        self.index = {}  # name -> data, least recently saved first
+        self.newer = []  # Log lines from a newer version of the game, kept through compaction
+        self.lines = 0
+        self.load()
+        self.writer = ProfileWriter(self)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def names(self):
+        """Profile names, most recently saved first"""
+        return list(reversed(self.index))
+
+    def get(self, name):
+        """Return a copy of a profile's data, or None if there is no such profile"""
+        data = self.index.get(name)
+        return dict(data) if data is not None else None
+
+    def save(self, name, data):
+        """Update a profile now; its record reaches the log in the background"""
+        self.index.pop(name, None)
+        self.index[name] = dict(data)
+        self.writer.save((name, data))
+
+    def flush(self):
+        self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+
+    def load(self):
+        """Rebuild the index by replaying the log"""
+        self.index.clear()
+        self.newer = []
+        self.lines = 0
+        if not os.path.exists(self.path):
+            return
+        damaged = 0
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    record = decode_record(line)
+                except ValueError:
+                    self.newer.append(line if line.endswith("\n") else line + "\n")
+                    self.lines += 1
+                    continue
+                if record is None:
+                    damaged += 1
+                    continue
+                name, data = record
+                self.index.pop(name, None)
+                self.index[name] = data
+                self.lines += 1
+        if self.newer:
+            print(f"Keeping {len(self.newer)} profile record(s) from a newer version in {self.path}")
+        if damaged:
+            # Rewrite without the damaged lines so later appends start on a clean line
+            print(f"Dropped {damaged} damaged profile record(s) from {self.path}")
+            self.compact()
+
+    def append(self, batch):
+        """Append records for a {name: data} batch (called on the writer thread)"""
+        text = "".join(encode_record(name, data) + "\n" for name, data in batch.items())
+        with open(self.path, "a") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        self.lines += len(batch)
+        if self.lines > COMPACT_FACTOR * (len(self.index) + len(self.newer)) + COMPACT_SLACK:
+            self.compact()
+
+    def compact(self):
+        """Atomically rewrite the log with one record per profile"""
+        snapshot = list(self.index.items())
+        newer = list(self.newer)
+        text = "".join(newer) + "".join(encode_record(name, data) + "\n" for name, data in snapshot)
+        write_atomic(self.path, text, keep_backup=False)
+        self.lines = len(newer) + len(snapshot)
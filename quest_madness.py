@@ -1,9 +1,20 @@
 import pygame
-import random
 import math
 import sys
 import json
-import os as os_module
+import random
+from collections import deque
+from particles import ParticleSystem
+from spatial import SpatialGrid
+from level_gen import CHUNK_WIDTH, JumpModel, LevelGenerator
+from savefile import read_save
+from profiles import ProfileStore
+from replay import InputRecorder
+from profiler import PROFILER
+from atlas import SpriteAtlas
+from assets import ASSETS
+from audio import SoundMixer
+from ecs import Column, Entity, EntityStore
 
 # Initialize Pygame
 pygame.init()
@@ -12,8 +23,14 @@ pygame.mixer.init()
 # ============ CONSTANTS ============
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 700
-FPS = 60
+FPS = 60  # Simulation steps per second (and menu frame rate)
+STEP_TIME = 1.0 / FPS
+RENDER_FPS = 120  # Frame rate cap while playing a level (set with --fps N, 0 for uncapped)
+MAX_STEPS_PER_FRAME = 5  # Catch-up limit: below FPS / 5 frames a second the game slows down
 LEVEL_WIDTH = 4000  # Much longer levels
+STATIC_CHUNK_WIDTH = SCREEN_WIDTH  # Width of each pre-baked static layer surface
+MAX_SLIDES = 3  # Platform contacts resolved per frame (e.g. land, then slide into a wall)
+LEDGE_TOLERANCE = 5  # Pixels of a platform's side the player can clip and still step up onto it
 
 # Audio paths (using pygame's built-in example sounds)
 import os
@@ -22,9 +39,23 @@ MUSIC_FILE = os.path.join(PYGAME_DATA_PATH, 'house_lo.ogg')
 JUMP_SOUND = os.path.join(PYGAME_DATA_PATH, 'punch.wav')
 COIN_SOUND = os.path.join(PYGAME_DATA_PATH, 'whiff.wav')
 ENEMY_KILL_SOUND = os.path.join(PYGAME_DATA_PATH, 'boom.wav')
-
-# Save file path for progress
+# (path, volume) of the jump, coin and enemy kill sounds
+LEVEL_SOUNDS = [(JUMP_SOUND, 0.3), (COIN_SOUND, 0.2), (ENEMY_KILL_SOUND, 0.4)]
+# Sound effect categories and the mixer channels reserved for each
+SOUND_CATEGORIES = {'player': 1, 'pickup': 2, 'combat': 3}
+# Priorities within a category (higher may steal a channel from lower)
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 1
+PRIORITY_HIGH = 2
+AUDIO = SoundMixer(SOUND_CATEGORIES)
+
+# Save file path for progress (single-profile saves, imported into the profile store)
 SAVE_FILE = 'quest_madness_save.json'
+PROFILES_FILE = 'quest_madness_profiles.log'
+DEFAULT_PROFILE = 'Player 1'
+
+# Directory every level run is recorded into as a replay (set with --record DIR)
+RECORD_DIR = None
 
 # Colors
 BLACK = (0, 0, 0)
@@ -62,101 +93,161 @@ LEVEL_THEMES = {
 }
 
 # ============ SAVE/LOAD FUNCTIONS ============
+# Profile store, opened on first use
+_PROFILES = None
+
+def get_profile_store():
+    """Open the profile store, importing the old single-profile save the first time"""
+    global _PROFILES
+    if _PROFILES is None:
+        _PROFILES = ProfileStore(PROFILES_FILE)
+        if not len(_PROFILES):
+            legacy = read_save(SAVE_FILE)
+            if legacy is not None:
+                _PROFILES.save(DEFAULT_PROFILE, legacy)
+    return _PROFILES
+
 def save_progress(player_stats):
-    """Save game progress to file"""
-    try:
-        save_data = {
-            'crystals': player_stats['crystals'],
-            'coins': player_stats['coins'],
-            'max_health': player_stats['max_health'],
-            'speed_bonus': player_stats['speed_bonus'],
-            'highest_level': player_stats.get('highest_level', 1)
-        }
-        with open(SAVE_FILE, 'w') as f:
-            json.dump(save_data, f)
-        print(f"Progress saved to {SAVE_FILE}")
-    except Exception as e:
-        print(f"Error saving progress: {e}")
-
-def load_progress():
-    """Load game progress from file"""
-    try:
-        if os_module.path.exists(SAVE_FILE):
-            with open(SAVE_FILE, 'r') as f:
-                save_data = json.load(f)
-            return {
-                'crystals': save_data.get('crystals', 0),
-                'coins': save_data.get('coins', 0),
-                'max_health': save_data.get('max_health', 100),
-                'speed_bonus': save_data.get('speed_bonus', 0),
-                'lives': 999,  # Infinite lives
-                'highest_level': save_data.get('highest_level', 1)
-            }
-    except Exception as e:
-        print(f"Error loading progress: {e}")
-    
-    # Return default stats if no save found
+    """Save the current profile's progress (written in the background, never blocks on disk)"""
+    save_data = {
+        'crystals': player_stats['crystals'],
+        'coins': player_stats['coins'],
+        'max_health': player_stats['max_health'],
+        'speed_bonus': player_stats['speed_bonus'],
+        'highest_level': player_stats.get('highest_level', 1)
+    }
+    get_profile_store().save(player_stats.get('profile', DEFAULT_PROFILE), save_data)
+
+def load_progress(profile=None):
+    """Load a profile's progress; defaults to the most recently saved profile"""
+    store = get_profile_store()
+    if profile is None:
+        profile = store.names()[0] if len(store) else DEFAULT_PROFILE
+    save_data = store.get(profile) or {}
     return {
-        'crystals': 0,
-        'coins': 0,
-        'max_health': 100,
-        'speed_bonus': 0,
+        'profile': profile,
+        'crystals': save_data.get('crystals', 0),
+        'coins': save_data.get('coins', 0),
+        'max_health': save_data.get('max_health', 100),
+        'speed_bonus': save_data.get('speed_bonus', 0),
         'lives': 999,  # Infinite lives
-        'highest_level': 1
+        'highest_level': save_data.get('highest_level', 1)
     }
 
-# ============ PARTICLE CLASS ============
-class Particle(pygame.sprite.Sprite):
-    def __init__(self, x, y, color, vel_x, vel_y, lifetime=30):
-        super().__init__()
-        self.width = 5
-        self.height = 5
-        self.image = pygame.Surface((self.width, self.height))
-        self.image.fill(color)
-        self.rect = self.image.get_rect(center=(x, y))
-        self.vel_x = vel_x
-        self.vel_y = vel_y
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.color = color
-
-    def update(self):
-        """Update particle physics"""
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
-        self.vel_y += 0.2  # Gravity
-        self.lifetime -= 1
-        
-        # Fade out
-        alpha = int((self.lifetime / self.max_lifetime) * 255)
-        self.image.set_alpha(alpha)
+# ============ LEVEL FILES ============
+# Levels live in levels/level_<n>.json. Each object list holds compact rows:
+#   platforms:    [x, y, width, height, style (0 = platform, 1 = platform_light), move_range (0 = static)]
+#   spikes:       [x, y]                  (top-left)
+#   checkpoints:  [x, y, checkpoint_id]   (center)
+#   coins:        [x, y]                  (center)
+#   collectibles: [x, y]                  (center)
+#   enemies:      [x, y, patrol_range]    (top-left)
+#   goal:         [x, y]                  (center)
+LEVEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'levels')
+
+# Parsed level templates, keyed by level number
+_LEVEL_TEMPLATES = {}
+
+def get_level_path(level_num):
+    return os.path.join(LEVEL_DIR, f'level_{level_num}.json')
+
+def load_level_template(level_num):
+    """Return the parsed template for a level, reading its file only once"""
+    template = _LEVEL_TEMPLATES.get(level_num)
+    if template is None:
+        with open(get_level_path(level_num)) as f:
+            template = json.load(f)
+        _LEVEL_TEMPLATES[level_num] = template
+    return template
+
+def count_levels():
+    """Number of consecutive level files, starting from level 1"""
+    count = 0
+    while os.path.exists(get_level_path(count + 1)):
+        count += 1
+    return count
+
+# ============ SPRITE ATLAS ============
+COLLECTIBLE_SPIN_FRAMES = 12  # Frames per half turn of a crystal
+GOAL_ROTATION_FRAMES = 36  # One frame every 10 degrees
+
+_ATLAS = None
+
+def get_sprite(name):
+    """Shared image (or list of animation frames) for an entity type/state.
+
+    Every image is drawn once into the atlas on first use; entities only
+    hold references to its subsurfaces.
+    """
+    global _ATLAS
+    if _ATLAS is None:
+        atlas = SpriteAtlas()
+        atlas.add('checkpoint', (40, 40), lambda surface: Checkpoint.render(surface, GRAY))
+        atlas.add('checkpoint_active', (40, 40), lambda surface: Checkpoint.render(surface, CYAN))
+        atlas.add('spike', (20, 25), Spike.render, alpha=True)
+        atlas.add('coin', (15, 15), Coin.render)
+        atlas.add_frames('collectible', (20, 20), Collectible.render, COLLECTIBLE_SPIN_FRAMES)
+        atlas.add('enemy', (25, 25), lambda surface: Enemy.render(surface, False))
+        atlas.add('enemy_attack', (25, 25), lambda surface: Enemy.render(surface, True))
+        atlas.add_frames('goal', (35, 35), Goal.render, GOAL_ROTATION_FRAMES)
+        _ATLAS = atlas
+    return _ATLAS[name]
 
 # ============ CHECKPOINT CLASS ============
-class Checkpoint(pygame.sprite.Sprite):
+class Checkpoint(Entity):
     def __init__(self, x, y, checkpoint_id):
-        super().__init__()
         self.width = 40
         self.height = 40
-        self.image = pygame.Surface((self.width, self.height))
-        self.rect = self.image.get_rect(center=(x, y))
         self.checkpoint_id = checkpoint_id
         self.activated = False
-        self.draw_checkpoint()
-
-    def draw_checkpoint(self):
-        """Draw checkpoint flag"""
-        self.image.fill(DARK_BLUE)
-        if self.activated:
-            pygame.draw.rect(self.image, CYAN, (0, 0, self.width, self.height), 3)
-            pygame.draw.polygon(self.image, CYAN, [(5, 5), (25, 10), (5, 15)])
-        else:
-            pygame.draw.rect(self.image, GRAY, (0, 0, self.width, self.height), 3)
-            pygame.draw.polygon(self.image, GRAY, [(5, 5), (25, 10), (5, 15)])
+        self.update_image()
+        self.rect = self.image.get_rect(center=(x, y))
+
+    @staticmethod
+    def render(surface, color):
+        """Draw a checkpoint flag in `color` (atlas image)"""
+        surface.fill(DARK_BLUE)
+        pygame.draw.rect(surface, color, surface.get_rect(), 3)
+        pygame.draw.polygon(surface, color, [(5, 5), (25, 10), (5, 15)])
+
+    def update_image(self):
+        """Pick the checkpoint flag for the current state"""
+        self.image = get_sprite('checkpoint_active' if self.activated else 'checkpoint')
 
     def activate(self):
         """Activate checkpoint"""
         self.activated = True
-        self.draw_checkpoint()
+        self.update_image()
+
+# ============ COLLISION ============
+def sweep_rect(rect, dx, dy, obstacle):
+    """Earliest time of impact of `rect` moving by (dx, dy) with `obstacle`.
+
+    Returns (t, axis) with t in [0, 1) as a fraction of the move and axis
+    'x' or 'y' for the side that was hit, or None if the rect doesn't run
+    into the obstacle. Rects only touching edges don't collide.
+    """
+    if dx > 0:
+        x_entry, x_exit = (obstacle.left - rect.right) / dx, (obstacle.right - rect.left) / dx
+    elif dx < 0:
+        x_entry, x_exit = (obstacle.right - rect.left) / dx, (obstacle.left - rect.right) / dx
+    elif rect.left < obstacle.right and obstacle.left < rect.right:
+        x_entry, x_exit = -math.inf, math.inf
+    else:
+        return None
+    if dy > 0:
+        y_entry, y_exit = (obstacle.top - rect.bottom) / dy, (obstacle.bottom - rect.top) / dy
+    elif dy < 0:
+        y_entry, y_exit = (obstacle.bottom - rect.top) / dy, (obstacle.top - rect.bottom) / dy
+    elif rect.top < obstacle.bottom and obstacle.top < rect.bottom:
+        y_entry, y_exit = -math.inf, math.inf
+    else:
+        return None
+    entry = max(x_entry, y_entry)
+    if entry < 0 or entry >= 1 or entry >= min(x_exit, y_exit):
+        return None
+    # A corner hit counts as vertical, so the player lands rather than sticks to the side
+    return entry, 'y' if y_entry >= x_entry else 'x'
 
 # ============ PLAYER CLASS ============
 class Player(pygame.sprite.Sprite):
@@ -180,6 +271,8 @@ class Player(pygame.sprite.Sprite):
         self.on_ground = False
         self.on_wall = False
         self.wall_side = None  # 'left' or 'right'
+        self.min_x = 0  # Horizontal limits of the world, set by the level
+        self.max_x = LEVEL_WIDTH
         
         self.health = 100
         self.coins = 0
@@ -234,23 +327,118 @@ class Player(pygame.sprite.Sprite):
         self.vel_y = 0
         self.health = 100
         
-        for _ in range(15):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 5)
-            vel_x = math.cos(angle) * speed
-            vel_y = math.sin(angle) * speed
-            particles.append(Particle(self.rect.centerx, self.rect.centery, CYAN, vel_x, vel_y, 40))
+        particles.emit(self.rect.centerx, self.rect.centery, CYAN, 15, 2, 5, 40)
 
     def set_checkpoint(self, x, y, particles):
         """Set new checkpoint"""
         self.checkpoint_x = x
         self.checkpoint_y = y
-        for _ in range(10):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, 3)
-            vel_x = math.cos(angle) * speed
-            vel_y = math.sin(angle) * speed
-            particles.append(Particle(x, y, CYAN, vel_x, vel_y, 30))
+        particles.emit(x, y, CYAN, 10, 1, 3, 30)
+
+    def hit_ground(self):
+        self.vel_y = 0
+        self.on_ground = True
+
+    def hit_ceiling(self):
+        self.vel_y = 0
+
+    def hit_wall(self, side):
+        """Touch a wall on `side` ('left' or 'right') of the player"""
+        self.on_wall = True
+        self.wall_side = side
+        self.vel_y *= 0.9  # Slow fall on wall
+
+    def depenetrate(self, platform):
+        """Push the player out of a platform it already overlaps, along the shallowest side"""
+        rect, other = self.rect, platform.rect
+        pushes = [
+            (rect.bottom - other.top, 'up'),
+            (other.bottom - rect.top, 'down'),
+            (rect.right - other.left, 'left'),
+            (other.right - rect.left, 'right'),
+        ]
+        _, direction = min(pushes)
+        if direction == 'up':
+            rect.bottom = other.top
+            self.hit_ground()
+        elif direction == 'down':
+            rect.top = other.bottom
+            self.hit_ceiling()
+        elif direction == 'left':
+            rect.right = other.left
+            self.hit_wall('right')
+        else:
+            rect.left = other.right
+            self.hit_wall('left')
+
+    def move_and_collide(self, platforms):
+        """Move by this frame's velocity, stopping at the first platform in the way.
+
+        The move is swept against every platform in the rect covering its
+        start and end, so no speed can carry the player through a platform.
+        After a hit the rest of the move slides along the platform.
+        """
+        rect = self.rect
+        # A platform may have moved into the player since last frame
+        for platform in platforms.query(rect):
+            if rect.colliderect(platform.rect):
+                self.depenetrate(platform)
+
+        # The pixel displacement a plain rect.x += vel_x would give
+        target = rect.copy()
+        target.x += self.vel_x
+        target.y += self.vel_y
+        dx = target.x - rect.x
+        dy = target.y - rect.y
+        dx = min(max(dx, self.min_x - rect.left), self.max_x - rect.right)
+
+        swept = rect.union(rect.move(dx, dy))
+        candidates = [platform for platform in platforms.query(swept) if swept.colliderect(platform.rect)]
+
+        rising = self.vel_y < 0  # Stays set after a ceiling hit zeroes vel_y
+        for _ in range(MAX_SLIDES):
+            if not dx and not dy:
+                break
+            hit = None
+            for platform in candidates:
+                impact = sweep_rect(rect, dx, dy, platform.rect)
+                if impact is not None and (hit is None or impact[0] < hit[0]):
+                    hit = impact + (platform,)
+            if hit is None:
+                rect.move_ip(dx, dy)
+                break
+
+            t, axis, platform = hit
+            if axis == 'y':
+                rect.x += int(dx * t)
+                dx -= int(dx * t)
+                if dy > 0:
+                    rect.bottom = platform.rect.top
+                    self.hit_ground()
+                else:
+                    rect.top = platform.rect.bottom
+                    self.hit_ceiling()
+                dy = 0
+            else:
+                rect.x += int(dx * t)
+                dx -= int(dx * t)
+                rect.y += int(dy * t)
+                dy -= int(dy * t)
+                raised = rect.move(0, platform.rect.top - rect.bottom)
+                if (not rising and rect.bottom - platform.rect.top <= LEDGE_TOLERANCE
+                        and not any(raised.colliderect(other.rect) for other in platforms.query(raised))):
+                    # Clipped the top corner with room above: step up onto the platform and keep going
+                    rect.bottom = platform.rect.top
+                    self.hit_ground()
+                    dy = 0
+                    continue
+                if dx > 0:
+                    rect.right = platform.rect.left
+                    self.hit_wall('right')
+                else:
+                    rect.left = platform.rect.right
+                    self.hit_wall('left')
+                dx = 0
 
     def update(self, platforms, spikes, coins, collectibles, goal, particles):
         """Update player physics and collisions"""
@@ -258,76 +446,36 @@ class Player(pygame.sprite.Sprite):
         if self.vel_y > 20:
             self.vel_y = 20
 
-        # Store old position for better collision detection
-        old_x = self.rect.x
-        old_y = self.rect.y
-        
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
-
-        if self.rect.left < 0:
-            self.rect.left = 0
-        if self.rect.right > LEVEL_WIDTH:
-            self.rect.right = LEVEL_WIDTH
-
         self.on_ground = False
         self.on_wall = False
-        
-        for platform in platforms:
-            if self.rect.colliderect(platform.rect):
-                # Ground collision - player falling onto platform
-                if self.vel_y > 0 and old_y + self.height <= platform.rect.top + 5:
-                    self.rect.bottom = platform.rect.top
-                    self.vel_y = 0
-                    self.on_ground = True
-                # Ceiling collision - player jumping into platform
-                elif self.vel_y < 0 and old_y >= platform.rect.bottom - 5:
-                    self.rect.top = platform.rect.bottom
-                    self.vel_y = 0
-                # Wall collision (left side)
-                elif self.vel_x < 0 and old_x + self.width <= platform.rect.right + 5:
-                    self.rect.left = platform.rect.right
-                    self.on_wall = True
-                    self.wall_side = 'left'
-                    self.vel_y *= 0.9  # Slow fall on wall
-                # Wall collision (right side)
-                elif self.vel_x > 0 and old_x >= platform.rect.left - 5:
-                    self.rect.right = platform.rect.left
-                    self.on_wall = True
-                    self.wall_side = 'right'
-                    self.vel_y *= 0.9  # Slow fall on wall
-
-        for spike in spikes:
+        self.move_and_collide(platforms)
+
+        # Broad phase: only objects in grid cells near the player
+        nearby = self.rect.inflate(64, 64)
+
+        for spike in spikes.query(nearby):
             if self.rect.colliderect(spike.rect):
                 self.health -= 1
                 if self.health <= 0:
                     return "dead"
 
-        for coin in coins[:]:
+        for coin in coins.query(nearby):
             if self.rect.colliderect(coin.rect):
                 self.coins += 1
                 self.score += 10
                 coins.remove(coin)
-                for _ in range(8):
-                    angle = random.uniform(0, 2 * math.pi)
-                    speed = random.uniform(2, 4)
-                    vel_x = math.cos(angle) * speed
-                    vel_y = math.sin(angle) * speed
-                    particles.append(Particle(coin.rect.centerx, coin.rect.centery, YELLOW, vel_x, vel_y, 20))
-
-        for collectible in collectibles[:]:
+                coin.despawn()
+                particles.emit(coin.rect.centerx, coin.rect.centery, YELLOW, 8, 2, 4, 20)
+
+        for collectible in collectibles.query(nearby):
             if self.rect.colliderect(collectible.rect):
                 self.crystals += 1
                 self.score += 25
                 collectibles.remove(collectible)
-                for _ in range(12):
-                    angle = random.uniform(0, 2 * math.pi)
-                    speed = random.uniform(2, 5)
-                    vel_x = math.cos(angle) * speed
-                    vel_y = math.sin(angle) * speed
-                    particles.append(Particle(collectible.rect.centerx, collectible.rect.centery, PURPLE, vel_x, vel_y, 25))
-
-        if self.rect.colliderect(goal.rect):
+                collectible.despawn()
+                particles.emit(collectible.rect.centerx, collectible.rect.centery, PURPLE, 12, 2, 5, 25)
+
+        if goal is not None and self.rect.colliderect(goal.rect):
             self.score += 100
             return "goal"
 
@@ -338,9 +486,13 @@ class Player(pygame.sprite.Sprite):
         return None
 
 # ============ PLATFORM CLASS ============
-class Platform(pygame.sprite.Sprite):
+class Platform(Entity):
+    COMPONENTS = ('patrol',)
+    vel_x = Column('vel_x', 2)
+    original_x = Column('origin_x')
+    move_range = Column('patrol_range')
+
     def __init__(self, x, y, width, height, color=GREEN, moving=False, move_range=0):
-        super().__init__()
         self.width = width
         self.height = height
         self.image = pygame.Surface((width, height))
@@ -348,7 +500,6 @@ class Platform(pygame.sprite.Sprite):
         self.color = color
         self.moving = moving
         self.move_range = move_range
-        self.move_direction = 1
         self.original_x = x
         self.draw_platform()
 
@@ -357,82 +508,104 @@ class Platform(pygame.sprite.Sprite):
         self.image.fill(self.color)
         pygame.draw.rect(self.image, WHITE, (0, 0, self.width, self.height), 2)
 
-    def update(self):
-        """Update platform position if moving"""
-        if self.moving:
-            self.rect.x += self.move_direction * 2
-            if abs(self.rect.x - self.original_x) > self.move_range:
-                self.move_direction *= -1
-
 # ============ SPIKE CLASS ============
-class Spike(pygame.sprite.Sprite):
+class Spike(Entity):
     def __init__(self, x, y):
-        super().__init__()
         self.width = 20
         self.height = 25
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.image = get_sprite('spike')
         self.rect = self.image.get_rect(topleft=(x, y))
-        self.draw_spike()
 
-    def draw_spike(self):
-        """Draw spike triangle"""
-        points = [(self.width // 2, 0), (self.width, self.height), (0, self.height)]
-        pygame.draw.polygon(self.image, RED, points)
+    @staticmethod
+    def render(surface):
+        """Draw spike triangle (atlas image)"""
+        width, height = surface.get_size()
+        pygame.draw.polygon(surface, RED, [(width // 2, 0), (width, height), (0, height)])
 
 # ============ COIN CLASS ============
-class Coin(pygame.sprite.Sprite):
+class Coin(Entity):
+    COMPONENTS = ('bob',)
+    bob_offset = Column('bob_t')
+    original_y = Column('origin_y')
+    bob_step = Column('bob_step', 0.1)
+    bob_scale = Column('bob_scale', 1)
+    bob_amp = Column('bob_amp', 5)
+
     def __init__(self, x, y):
-        super().__init__()
         self.width = 15
         self.height = 15
-        self.image = pygame.Surface((self.width, self.height))
+        self.image = get_sprite('coin')
         self.rect = self.image.get_rect(center=(x, y))
         self.bob_offset = 0
         self.original_y = y
-        self.draw_coin()
 
-    def draw_coin(self):
-        """Draw coin"""
-        self.image.fill(DARK_BLUE)
-        pygame.draw.circle(self.image, YELLOW, (self.width // 2, self.height // 2), 7)
-        pygame.draw.circle(self.image, ORANGE, (self.width // 2, self.height // 2), 5)
+    def get_bounds(self):
+        """Area covered over the whole bob cycle"""
+        top = min(self.rect.top, self.original_y - 5)
+        return pygame.Rect(self.rect.x, top, self.width, self.original_y + 5 + self.height - top)
 
-    def update(self):
-        """Make coin bob up and down"""
-        self.bob_offset += 0.1
-        self.rect.y = self.original_y + math.sin(self.bob_offset) * 5
+    @staticmethod
+    def render(surface):
+        """Draw coin (atlas image)"""
+        surface.fill(DARK_BLUE)
+        center = (surface.get_width() // 2, surface.get_height() // 2)
+        pygame.draw.circle(surface, YELLOW, center, 7)
+        pygame.draw.circle(surface, ORANGE, center, 5)
 
 # ============ COLLECTIBLE CLASS ============
-class Collectible(pygame.sprite.Sprite):
+class Collectible(Entity):
+    COMPONENTS = ('bob', 'anim')
+    # The spin angle drives both the bob and the spin animation
+    spin_angle = Column('bob_t')
+    original_y = Column('origin_y')
+    bob_step = Column('bob_step', 3)
+    bob_scale = Column('bob_scale', 0.1)
+    bob_amp = Column('bob_amp', 5)
+    anim_angle = Column('anim_t')
+    anim_step = Column('anim_step', 3)
+    anim_period = Column('anim_period', 180)
+    anim_frames = Column('anim_frames', COLLECTIBLE_SPIN_FRAMES)
+
     def __init__(self, x, y):
-        super().__init__()
         self.width = 20
         self.height = 20
-        self.image = pygame.Surface((self.width, self.height))
-        self.rect = self.image.get_rect(center=(x, y))
         self.spin_angle = 0
         self.original_y = y
-        self.draw_collectible()
+        self.update_image()
+        self.rect = self.image.get_rect(center=(x, y))
 
-    def draw_collectible(self):
-        """Draw crystal collectible"""
-        self.image.fill(DARK_BLUE)
-        pygame.draw.polygon(self.image, PURPLE, [
-            (10, 0), (20, 5), (15, 15), (10, 20), (5, 15), (0, 5)
+    def get_bounds(self):
+        """Area covered over the whole bob cycle"""
+        top = min(self.rect.top, self.original_y - 5)
+        return pygame.Rect(self.rect.x, top, self.width, self.original_y + 5 + self.height - top)
+
+    @staticmethod
+    def render(surface, frame):
+        """Draw spin frame `frame` of the crystal, squashed as it turns (atlas image)"""
+        surface.fill(DARK_BLUE)
+        scale = abs(math.cos(math.pi * frame / COLLECTIBLE_SPIN_FRAMES))
+        pygame.draw.polygon(surface, PURPLE, [
+            (10 + (x - 10) * scale, y) for x, y in ((10, 0), (20, 5), (15, 15), (10, 20), (5, 15), (0, 5))
         ])
 
-    def update(self):
-        """Make collectible spin and bob"""
-        self.spin_angle += 3
-        self.rect.y = self.original_y + math.sin(self.spin_angle * 0.1) * 5
+    def update_image(self):
+        """Pick the spin frame for the current angle (a half turn shows every frame)"""
+        frame = int(self.anim_angle) * COLLECTIBLE_SPIN_FRAMES // 180
+        self.image = get_sprite('collectible')[frame]
 
 # ============ ENEMY CLASS ============
-class Enemy(pygame.sprite.Sprite):
+class Enemy(Entity):
+    COMPONENTS = ('patrol',)
+    vel_x = Column('vel_x', 2)
+    original_x = Column('origin_x')
+    patrol_range = Column('patrol_range')
+    alive = Column('alive', True)
+    attack_cooldown = Column('cooldown')
+
     def __init__(self, x, y, patrol_range=100):
-        super().__init__()
         self.width = 25
         self.height = 25
-        self.image = pygame.Surface((self.width, self.height))
+        self.image = get_sprite('enemy')
         self.rect = self.image.get_rect(topleft=(x, y))
         
         self.vel_x = 2
@@ -442,38 +615,30 @@ class Enemy(pygame.sprite.Sprite):
         self.alive = True
         self.attack_cooldown = 0
         self.attack_range = 80
-        self.draw_enemy()
-
-    def draw_enemy(self):
-        """Draw enemy"""
-        if self.alive:
-            self.image.fill(RED)
-            pygame.draw.rect(self.image, DARK_BLUE, (0, 0, self.width, self.height), 2)
-            pygame.draw.circle(self.image, WHITE, (7, 8), 2)
-            pygame.draw.circle(self.image, WHITE, (18, 8), 2)
-            pygame.draw.circle(self.image, BLACK, (7, 8), 1)
-            pygame.draw.circle(self.image, BLACK, (18, 8), 1)
-            # Draw fangs when attacking
-            if self.attack_cooldown > 0:
-                pygame.draw.polygon(self.image, ORANGE, [(8, 15), (10, 20), (12, 15)])
-                pygame.draw.polygon(self.image, ORANGE, [(15, 15), (17, 20), (19, 15)])
-
-    def update(self):
-        """Patrol back and forth"""
+        self.update_image()
+
+    @staticmethod
+    def render(surface, attacking):
+        """Draw enemy, with fangs when attacking (atlas image)"""
+        surface.fill(RED)
+        pygame.draw.rect(surface, DARK_BLUE, surface.get_rect(), 2)
+        pygame.draw.circle(surface, WHITE, (7, 8), 2)
+        pygame.draw.circle(surface, WHITE, (18, 8), 2)
+        pygame.draw.circle(surface, BLACK, (7, 8), 1)
+        pygame.draw.circle(surface, BLACK, (18, 8), 1)
+        if attacking:
+            pygame.draw.polygon(surface, ORANGE, [(8, 15), (10, 20), (12, 15)])
+            pygame.draw.polygon(surface, ORANGE, [(15, 15), (17, 20), (19, 15)])
+
+    def update_image(self):
+        """Pick the enemy image for the current attack state"""
         if self.alive:
-            self.rect.x += self.vel_x
-            
-            if abs(self.rect.x - self.original_x) > self.patrol_range:
-                self.vel_x *= -1
-            
-            # Cooldown for attacks
-            if self.attack_cooldown > 0:
-                self.attack_cooldown -= 1
+            self.image = get_sprite('enemy_attack' if self.attack_cooldown > 0 else 'enemy')
 
     def attack(self):
         """Prepare to attack"""
         self.attack_cooldown = 10
-        self.draw_enemy()
+        self.update_image()
 
     def take_damage(self, damage=1):
         """Enemy takes damage"""
@@ -486,238 +651,155 @@ class Enemy(pygame.sprite.Sprite):
     def kill_enemy(self, particles):
         """Kill enemy with particle effect"""
         self.alive = False
-        for _ in range(20):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 6)
-            vel_x = math.cos(angle) * speed
-            vel_y = math.sin(angle) * speed
-            particles.append(Particle(self.rect.centerx, self.rect.centery, RED, vel_x, vel_y, 30))
+        particles.emit(self.rect.centerx, self.rect.centery, RED, 20, 2, 6, 30)
 
 # ============ GOAL CLASS ============
-class Goal(pygame.sprite.Sprite):
+class Goal(Entity):
+    COMPONENTS = ('anim',)
+    rotation = Column('anim_t')
+    anim_step = Column('anim_step', 2)
+    anim_period = Column('anim_period', 360)
+    anim_frames = Column('anim_frames', GOAL_ROTATION_FRAMES)
+
     def __init__(self, x, y):
-        super().__init__()
         self.width = 35
         self.height = 35
-        self.image = pygame.Surface((self.width, self.height))
-        self.rect = self.image.get_rect(center=(x, y))
         self.rotation = 0
-        self.draw_goal()
-
-    def draw_goal(self):
-        """Draw goal star"""
-        self.image.fill(DARK_BLUE)
-        pygame.draw.circle(self.image, YELLOW, (self.width // 2, self.height // 2), 15)
-        pygame.draw.polygon(self.image, ORANGE, [
-            (self.width // 2, 5), (self.width - 5, self.height - 8),
-            (8, 12), (self.width - 8, 12), (5, self.height - 8)
-        ])
+        self.update_image()
+        self.rect = self.image.get_rect(center=(x, y))
 
-    def update(self):
-        """Make goal rotate"""
-        self.rotation = (self.rotation + 2) % 360
+    @staticmethod
+    def render(surface, frame):
+        """Draw the goal star turned by rotation frame `frame` (atlas image)"""
+        width, height = surface.get_size()
+        surface.fill(DARK_BLUE)
+        pygame.draw.circle(surface, YELLOW, (width // 2, height // 2), 15)
+        angle = 2 * math.pi * frame / GOAL_ROTATION_FRAMES
+        cos_a, sin_a = math.cos(angle), math.sin(angle)
+        cx, cy = width / 2, height / 2
+        star = [(width // 2, 5), (width - 5, height - 8), (8, 12), (width - 8, 12), (5, height - 8)]
+        star = [(cx + (x - cx) * cos_a - (y - cy) * sin_a, cy + (x - cx) * sin_a + (y - cy) * cos_a)
+                for x, y in star]
+        pygame.draw.polygon(surface, ORANGE, star)
+
+    def update_image(self):
+        """Pick the rotation frame for the current angle"""
+        self.image = get_sprite('goal')[int(self.rotation) * GOAL_ROTATION_FRAMES // 360]
 
 # ============ LEVEL CLASS ============
 class Level:
-    def __init__(self, level_num):
+    def __init__(self, level_num, seed=None):
         self.level_num = level_num
+        # Seeds everything random in the level so recorded runs replay exactly
+        self.seed = seed if seed is not None else random.randrange(2 ** 31)
+        self.title = f"Level {level_num}"
+        self.width = LEVEL_WIDTH
+        self.min_x = 0  # Left edge of the loaded world
         self.camera_x = 0
         self.player = Player(100, 600)
-        self.platforms = pygame.sprite.Group()
-        self.spikes = pygame.sprite.Group()
-        self.coins = []
-        self.collectibles = []
-        self.enemies = pygame.sprite.Group()
-        self.checkpoints = pygame.sprite.Group()
+        # Camera and player position at the start of the last step, for drawing between steps
+        self.prev_camera_x = 0
+        self.prev_player_pos = self.player.rect.topleft
+        self.platforms = SpatialGrid()
+        self.spikes = SpatialGrid()
+        self.coins = SpatialGrid()
+        self.collectibles = SpatialGrid()
+        self.enemies = SpatialGrid()
+        self.checkpoints = SpatialGrid()
+        self.moving_platforms = []
+        # Component columns of everything that moves or animates, updated in one batch per frame
+        self.entities = EntityStore(cell_size=self.platforms.cell_size)
         self.goal = None
-        self.particles = []
+        self.particles = ParticleSystem(seed=self.seed)
+        self.static_chunks = {}  # chunk index -> baked background + static geometry
         self.sounds_enabled = True
         
         # Set level theme
-        self.theme = LEVEL_THEMES.get(level_num, LEVEL_THEMES[1])
+        theme_num = self.load_template().get('theme', level_num)
+        self.theme = LEVEL_THEMES.get(theme_num, LEVEL_THEMES[1])
         self.background_color = self.theme['bg']
         
         self.load_sounds()
         self.generate_level()
+        self.player.max_x = self.width
 
     def load_sounds(self):
-        """Load sound effects"""
-        try:
-            self.jump_sound = pygame.mixer.Sound(JUMP_SOUND)
-            self.coin_sound = pygame.mixer.Sound(COIN_SOUND)
-            self.enemy_kill_sound = pygame.mixer.Sound(ENEMY_KILL_SOUND)
-            self.jump_sound.set_volume(0.3)
-            self.coin_sound.set_volume(0.2)
-            self.enemy_kill_sound.set_volume(0.4)
-        except Exception as e:
-            print(f"Error loading sounds: {e}")
+        """Fetch the shared sound effects (decoded once per process by the asset registry)"""
+        sounds = [ASSETS.sound(path, volume) for path, volume in LEVEL_SOUNDS]
+        if None in sounds:
             self.sounds_enabled = False
+        else:
+            self.jump_sound, self.coin_sound, self.enemy_kill_sound = sounds
+
+    def play_sound(self, category, sound, priority):
+        """Queue a sound effect; the mixer starts it when the frame's sounds are flushed"""
+        if self.sounds_enabled:
+            AUDIO.play(category, sound, priority)
+
+    def load_template(self):
+        return load_level_template(self.level_num)
+
+    def add_rows(self, rows):
+        """Create the objects described by template rows; returns them as (grid, object) pairs"""
+        colors = (self.theme['platform'], self.theme['platform_light'])
+        added = []
+
+        def place(grid, obj, bounds=None):
+            grid.add(obj, bounds)
+            added.append((grid, obj))
+
+        for x, y, width, height, style, move_range in rows['platforms']:
+            platform = Platform(x, y, width, height, colors[style], moving=move_range > 0, move_range=move_range)
+            place(self.platforms, platform)
+            if platform.moving:
+                self.moving_platforms.append(platform)
+                self.entities.add(platform, self.platforms)
+        for x, y in rows['spikes']:
+            place(self.spikes, Spike(x, y))
+        for x, y, checkpoint_id in rows['checkpoints']:
+            place(self.checkpoints, Checkpoint(x, y, checkpoint_id))
+        # Bobbing pickups get bounds covering their whole bob range
+        for x, y in rows['coins']:
+            coin = Coin(x, y)
+            place(self.coins, coin, coin.get_bounds())
+            self.entities.add(coin)
+        for x, y in rows['collectibles']:
+            collectible = Collectible(x, y)
+            place(self.collectibles, collectible, collectible.get_bounds())
+            self.entities.add(collectible)
+        for x, y, patrol_range in rows['enemies']:
+            enemy = Enemy(x, y, patrol_range)
+            place(self.enemies, enemy)
+            self.entities.add(enemy, self.enemies)
+        return added
+
+    def remove_objects(self, objects):
+        """Take objects returned by add_rows back out of the level"""
+        for grid, obj in objects:
+            if obj in grid:  # Collected pickups are already gone
+                grid.remove(obj)
+            obj.despawn()
+            if grid is self.platforms and obj.moving:
+                self.moving_platforms.remove(obj)
 
     def generate_level(self):
-        """Generate extended levels with checkpoints and themes"""
-        platform_color = self.theme['platform']
-        platform_light = self.theme['platform_light']
-        
-        if self.level_num == 1:
-            # Beginner level - Grass Fields with wall jump intro
-            self.platforms.add(Platform(0, 650, 250, 50, platform_color))
-            self.platforms.add(Platform(350, 550, 150, 40, platform_color))
-            self.platforms.add(Platform(600, 450, 150, 40, platform_color))
-            self.platforms.add(Platform(850, 350, 150, 40, platform_color))
-            self.platforms.add(Platform(1100, 450, 150, 40, platform_color))
-            self.platforms.add(Platform(1350, 550, 150, 40, platform_color))
-            self.platforms.add(Platform(1600, 400, 150, 40, platform_color))
-            self.platforms.add(Platform(1850, 500, 150, 40, platform_color))
-            self.platforms.add(Platform(2100, 350, 200, 40, platform_color))
-            self.platforms.add(Platform(2400, 450, 150, 40, platform_color))
-            self.platforms.add(Platform(2650, 550, 150, 40, platform_color))
-            self.platforms.add(Platform(2900, 400, 300, 40, platform_color))
-            
-            # Add narrow passages for wall jumping
-            self.platforms.add(Platform(500, 350, 40, 200, platform_light))  # Left wall
-            self.platforms.add(Platform(560, 350, 40, 200, platform_light))  # Right wall
-            
-            # Checkpoints
-            self.checkpoints.add(Checkpoint(425, 500, 1))
-            self.checkpoints.add(Checkpoint(1425, 500, 2))
-            self.checkpoints.add(Checkpoint(2475, 400, 3))
-            
-            # Coins
-            for x in [425, 675, 925, 1175, 1425, 1675, 1925, 2175, 2475, 2725, 2975]:
-                self.coins.append(Coin(x, 380))
-            
-            # Collectibles
-            for x in [600, 1350, 2100, 2650]:
-                self.collectibles.append(Collectible(x, 320))
-            
-            # Enemies
-            self.enemies.add(Enemy(450, 600, 80))
-            self.enemies.add(Enemy(1200, 500, 80))
-            self.enemies.add(Enemy(2000, 600, 80))
-            
-            self.goal = Goal(2975, 300)
+        """Build the level's objects from its (memoized) JSON template"""
+        template = self.load_template()
+        self.add_rows(template)
+        self.goal = Goal(*template['goal'])
+        self.entities.add(self.goal)
+        self.width = template.get('width', LEVEL_WIDTH)
 
-        elif self.level_num == 2:
-            # Intermediate level - Desert Wastes with wall jumping challenges
-            self.platforms.add(Platform(0, 650, 200, 50, platform_color))
-            self.platforms.add(Platform(250, 550, 130, 40, platform_light, moving=True, move_range=80))
-            self.platforms.add(Platform(500, 450, 130, 40, platform_color))
-            
-            # Wall jump section
-            self.platforms.add(Platform(750, 300, 40, 250, platform_light))  # Left wall
-            self.platforms.add(Platform(880, 300, 40, 250, platform_light))  # Right wall
-            self.platforms.add(Platform(1000, 400, 130, 40, platform_color))
-            
-            self.platforms.add(Platform(1250, 450, 130, 40, platform_light, moving=True, move_range=80))
-            self.platforms.add(Platform(1500, 350, 130, 40, platform_color))
-            
-            # Complex platforming section
-            self.platforms.add(Platform(1750, 500, 100, 40, platform_color))
-            self.platforms.add(Platform(1900, 450, 100, 40, platform_color))
-            self.platforms.add(Platform(2050, 400, 100, 40, platform_color))
-            self.platforms.add(Platform(2200, 350, 100, 40, platform_color))
-            
-            self.platforms.add(Platform(2350, 450, 130, 40, platform_light, moving=True, move_range=100))
-            self.platforms.add(Platform(2600, 550, 200, 40, platform_color))
-            self.platforms.add(Platform(2900, 400, 300, 40, platform_color))
-            
-            # Spikes around wall sections
-            for y in [550, 600]:
-                self.spikes.add(Spike(700, y))
-                self.spikes.add(Spike(920, y))
-            
-            for x in [1700, 1850, 2000, 2150, 2550]:
-                self.spikes.add(Spike(x, 600))
-            
-            # Checkpoints
-            self.checkpoints.add(Checkpoint(575, 400, 1))
-            self.checkpoints.add(Checkpoint(1200, 350, 2))
-            self.checkpoints.add(Checkpoint(1900, 300, 3))
-            self.checkpoints.add(Checkpoint(2700, 500, 4))
-            
-            # Coins
-            for x in [325, 575, 825, 1075, 1325, 1575, 1825, 2075, 2325, 2575, 2825, 3100]:
-                self.coins.append(Coin(x, 280))
-            
-            # Collectibles
-            for x in [750, 1500, 2200, 3000]:
-                self.collectibles.append(Collectible(x, 300))
-            
-            # More enemies to jump on
-            self.enemies.add(Enemy(300, 500, 80))
-            self.enemies.add(Enemy(900, 350, 80))
-            self.enemies.add(Enemy(1400, 350, 80))
-            self.enemies.add(Enemy(2000, 300, 80))
-            self.enemies.add(Enemy(2700, 500, 80))
-            
-            self.goal = Goal(3000, 300)
+    def stream(self):
+        """Per-frame hook for levels that load their world incrementally"""
 
-        elif self.level_num == 3:
-            # Expert level - Crystal Chamber
-            self.platforms.add(Platform(0, 650, 180, 50, platform_color))
-            self.platforms.add(Platform(200, 550, 100, 40, platform_light, moving=True, move_range=60))
-            self.platforms.add(Platform(400, 450, 100, 40, platform_color))
-            
-            # First wall jump challenge
-            self.platforms.add(Platform(600, 250, 40, 300, platform_light))  # Left wall
-            self.platforms.add(Platform(740, 250, 40, 300, platform_light))  # Right wall
-            self.platforms.add(Platform(850, 380, 100, 40, platform_color))
-            
-            self.platforms.add(Platform(1000, 480, 100, 40, platform_light, moving=True, move_range=100))
-            self.platforms.add(Platform(1200, 380, 100, 40, platform_color))
-            
-            # Second wall jump section with moving walls
-            self.platforms.add(Platform(1400, 300, 40, 250, platform_light, moving=True, move_range=50))
-            self.platforms.add(Platform(1540, 300, 40, 250, platform_light, moving=True, move_range=50))
-            self.platforms.add(Platform(1650, 380, 100, 40, platform_color))
-            
-            self.platforms.add(Platform(1800, 480, 100, 40, platform_light, moving=True, move_range=80))
-            self.platforms.add(Platform(2000, 350, 100, 40, platform_color))
-            
-            # Final jumping section
-            self.platforms.add(Platform(2200, 500, 80, 40, platform_color))
-            self.platforms.add(Platform(2320, 450, 80, 40, platform_color))
-            self.platforms.add(Platform(2440, 400, 80, 40, platform_color))
-            self.platforms.add(Platform(2560, 350, 80, 40, platform_color))
-            self.platforms.add(Platform(2680, 300, 80, 40, platform_color))
-            
-            self.platforms.add(Platform(2800, 500, 100, 40, platform_light, moving=True, move_range=100))
-            self.platforms.add(Platform(3050, 400, 350, 40, platform_color))
-            
-            # Spikes in dangerous areas
-            for x in [550, 790, 1350, 1580, 2150, 2270, 2390, 2510, 2630, 2750]:
-                self.spikes.add(Spike(x, 600))
-            
-            # Checkpoints
-            self.checkpoints.add(Checkpoint(300, 450, 1))
-            self.checkpoints.add(Checkpoint(850, 330, 2))
-            self.checkpoints.add(Checkpoint(1650, 330, 3))
-            self.checkpoints.add(Checkpoint(2450, 300, 4))
-            self.checkpoints.add(Checkpoint(2900, 450, 5))
-            
-            # Coins
-            for x in [250, 450, 750, 1000, 1200, 1650, 1800, 2200, 2350, 2500, 2650, 2800, 3150]:
-                self.coins.append(Coin(x, 280))
-            
-            # Collectibles scattered
-            for x in [600, 1400, 2000, 2700, 3200]:
-                self.collectibles.append(Collectible(x, 300))
-            
-            # Many enemies to jump on
-            self.enemies.add(Enemy(250, 500, 60))
-            self.enemies.add(Enemy(700, 300, 60))
-            self.enemies.add(Enemy(1050, 400, 60))
-            self.enemies.add(Enemy(1450, 300, 60))
-            self.enemies.add(Enemy(1850, 420, 60))
-            self.enemies.add(Enemy(2300, 420, 60))
-            self.enemies.add(Enemy(2700, 480, 60))
-            
-            self.goal = Goal(3200, 300)
+    def get_progress_text(self):
+        return f"Progress: {int((self.player.rect.x / self.width) * 100)}%"
 
     def update_camera(self):
         """Update camera position to follow player"""
-        target_camera_x = max(0, self.player.rect.centerx - SCREEN_WIDTH // 3)
-        target_camera_x = min(target_camera_x, LEVEL_WIDTH - SCREEN_WIDTH)
+        target_camera_x = max(self.min_x, self.player.rect.centerx - SCREEN_WIDTH // 3)
+        target_camera_x = min(target_camera_x, self.width - SCREEN_WIDTH)
         self.camera_x += (target_camera_x - self.camera_x) * 0.1
 
     def get_screen_rect(self, rect):
@@ -726,61 +808,89 @@ class Level:
         screen_rect.x -= self.camera_x
         return screen_rect
 
-    def draw(self, screen, font):
-        """Draw level"""
-        screen.fill(self.background_color)
-        
-        for platform in self.platforms:
-            screen_rect = self.get_screen_rect(platform.rect)
-            if -100 < screen_rect.x < SCREEN_WIDTH + 100:
-                screen.blit(platform.image, screen_rect)
-        
-        for spike in self.spikes:
-            screen_rect = self.get_screen_rect(spike.rect)
-            if -100 < screen_rect.x < SCREEN_WIDTH + 100:
-                screen.blit(spike.image, screen_rect)
-        
-        for coin in self.coins:
-            screen_rect = self.get_screen_rect(coin.rect)
-            if -100 < screen_rect.x < SCREEN_WIDTH + 100:
-                screen.blit(coin.image, screen_rect)
-        
-        for collectible in self.collectibles:
-            screen_rect = self.get_screen_rect(collectible.rect)
-            if -100 < screen_rect.x < SCREEN_WIDTH + 100:
-                screen.blit(collectible.image, screen_rect)
-        
-        for enemy in self.enemies:
+    def get_static_chunk(self, index, screen):
+        """Return the baked static layer for chunk `index`, rendering it on first use"""
+        chunk = self.static_chunks.get(index)
+        if chunk is None:
+            chunk = pygame.Surface((STATIC_CHUNK_WIDTH, SCREEN_HEIGHT), 0, screen)
+            chunk.fill(self.background_color)
+            area = chunk.get_rect(x=index * STATIC_CHUNK_WIDTH)
+            for platform in self.platforms.query(area):
+                if not platform.moving:
+                    chunk.blit(platform.image, (platform.rect.x - area.x, platform.rect.y))
+            for obj in self.spikes.query(area) + self.checkpoints.query(area):
+                chunk.blit(obj.image, (obj.rect.x - area.x, obj.rect.y))
+            self.static_chunks[index] = chunk
+        return chunk
+
+    def rebake_static(self, obj):
+        """Redraw a static object whose image changed into the chunks already baked"""
+        first = obj.rect.left // STATIC_CHUNK_WIDTH
+        last = (obj.rect.right - 1) // STATIC_CHUNK_WIDTH
+        for index in range(first, last + 1):
+            chunk = self.static_chunks.get(index)
+            if chunk is not None:
+                chunk.blit(obj.image, (obj.rect.x - index * STATIC_CHUNK_WIDTH, obj.rect.y))
+
+    def draw(self, screen, font, alpha=None):
+        """Draw level; with `alpha`, moving things are drawn that far between the last step's start and end"""
+        entities = self.entities
+        if alpha is None:
+            camera_x = self.camera_x
+            xs = ys = None
+        else:
+            camera_x = self.prev_camera_x + (self.camera_x - self.prev_camera_x) * alpha
+            xs, ys = entities.interpolated(alpha)
+
+        def blit(obj):
+            if xs is not None and obj.store is entities:
+                x, y = xs[obj.index], ys[obj.index]
+            else:
+                x, y = obj.rect.topleft
+            screen.blit(obj.image, (round(x - camera_x), round(y)))
+
+        # Static layer: at most two pre-baked chunks cover the screen
+        first = int(camera_x) // STATIC_CHUNK_WIDTH
+        for index in (first, first + 1):
+            if index * STATIC_CHUNK_WIDTH < camera_x + SCREEN_WIDTH:
+                chunk = self.get_static_chunk(index, screen)
+                screen.blit(chunk, (round(index * STATIC_CHUNK_WIDTH - camera_x), 0))
+
+        # Only visit dynamic objects in grid cells overlapping the camera window
+        view = pygame.Rect(int(camera_x) - 100, 0, SCREEN_WIDTH + 200, SCREEN_HEIGHT)
+
+        for platform in self.moving_platforms:
+            if view.colliderect(platform.rect):
+                blit(platform)
+
+        for grid in (self.coins, self.collectibles):
+            for obj in grid.query(view):
+                blit(obj)
+
+        for enemy in self.enemies.query(view):
             if enemy.alive:  # Only draw alive enemies
-                screen_rect = self.get_screen_rect(enemy.rect)
-                if -100 < screen_rect.x < SCREEN_WIDTH + 100:
-                    screen.blit(enemy.image, screen_rect)
-        
-        for checkpoint in self.checkpoints:
-            screen_rect = self.get_screen_rect(checkpoint.rect)
-            if -100 < screen_rect.x < SCREEN_WIDTH + 100:
-                screen.blit(checkpoint.image, screen_rect)
-        
-        screen_rect = self.get_screen_rect(self.goal.rect)
-        if -100 < screen_rect.x < SCREEN_WIDTH + 100:
-            screen.blit(self.goal.image, screen_rect)
-        
-        screen_rect = self.get_screen_rect(self.player.rect)
-        screen.blit(self.player.image, screen_rect)
+                blit(enemy)
+
+        if self.goal is not None and view.colliderect(self.goal.rect):
+            blit(self.goal)
+
+        player_x, player_y = self.player.rect.topleft
+        if alpha is not None:
+            prev_x, prev_y = self.prev_player_pos
+            player_x = prev_x + (player_x - prev_x) * alpha
+            player_y = prev_y + (player_y - prev_y) * alpha
+        screen.blit(self.player.image, (round(player_x - camera_x), round(player_y)))
         
         # Draw particles
-        for particle in self.particles[:]:
-            screen_rect = self.get_screen_rect(particle.rect)
-            if -100 < screen_rect.x < SCREEN_WIDTH + 100:
-                screen.blit(particle.image, screen_rect)
+        self.particles.draw(screen, camera_x)
         
         # HUD
-        level_text = font.render(f"Level {self.level_num}", True, WHITE)
+        level_text = font.render(self.title, True, WHITE)
         health_text = font.render(f"Health: {max(0, self.player.health)}", True, RED)
         coins_text = font.render(f"Coins: {self.player.coins}", True, YELLOW)
         crystals_text = font.render(f"Crystals: {self.player.crystals}", True, PURPLE)
         score_text = font.render(f"Score: {self.player.score}", True, CYAN)
-        progress_text = font.render(f"Progress: {int((self.player.rect.x / LEVEL_WIDTH) * 100)}%", True, LIGHT_BLUE)
+        progress_text = font.render(self.get_progress_text(), True, LIGHT_BLUE)
         
         screen.blit(level_text, (10, 10))
         screen.blit(health_text, (10, 40))
@@ -789,38 +899,29 @@ class Level:
         screen.blit(score_text, (10, 130))
         screen.blit(progress_text, (SCREEN_WIDTH - 250, 10))
 
-    def run(self, screen, clock, font):
-        """Main game loop for level"""
-        running = True
-        while running and self.player.alive:
-            clock.tick(FPS)
-            
-            keys = pygame.key.get_pressed()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return None
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        return None
-
-            # Track old state for sound effects
-            old_coins = self.player.coins
-            old_crystals = self.player.crystals
-            old_vel_y = self.player.vel_y
-            old_on_ground = self.player.on_ground
-            
-            attacking = self.player.handle_input(keys)
-            
-            self.platforms.update()
-            self.enemies.update()
-            for coin in self.coins:
-                coin.update()
-            for collectible in self.collectibles:
-                collectible.update()
-            
+    def step(self, keys):
+        """Advance the level one frame with the given key state; returns True when the goal is reached"""
+        # Where this step starts from, for drawing between steps
+        self.prev_camera_x = self.camera_x
+        self.prev_player_pos = self.player.rect.topleft
+        self.entities.snapshot()
+        
+        # Track old state for sound effects
+        old_coins = self.player.coins
+        old_crystals = self.player.crystals
+        old_vel_y = self.player.vel_y
+        old_on_ground = self.player.on_ground
+        
+        attacking = self.player.handle_input(keys)
+        
+        # Patrol, bob and animation systems for every entity at once; only
+        # entities that crossed a cell edge are re-bucketed in their grid
+        self.entities.update()
+        
+        with PROFILER.scope("collisions"):
             # Handle player attacking enemies
             if attacking:
-                for enemy in self.enemies:
+                for enemy in self.enemies.query(self.player.rect.inflate(120, 120)):
                     if enemy.alive:
                         # Check if enemy is in attack range (close to player)
                         dist = math.sqrt((enemy.rect.centerx - self.player.rect.centerx)**2 + 
@@ -829,63 +930,147 @@ class Level:
                             if enemy.take_damage(1):  # Remove 1 health
                                 enemy.kill_enemy(self.particles)
                                 self.player.score += 50
-                                if self.sounds_enabled:
-                                    self.enemy_kill_sound.play()
+                                self.play_sound('combat', self.enemy_kill_sound, PRIORITY_HIGH)
                             else:
                                 enemy.attack()
-            
+        
             # Check enemy collisions
-            for enemy in self.enemies:
+            for enemy in self.enemies.query(self.player.rect):
                 if enemy.alive and self.player.rect.colliderect(enemy.rect):
                     # Jump on enemy to kill it
                     if self.player.vel_y > 0 and self.player.rect.bottom - self.player.vel_y <= enemy.rect.top:
                         enemy.kill_enemy(self.particles)
                         self.player.vel_y = self.player.jump_power  # Bounce off
                         self.player.score += 50
-                        if self.sounds_enabled:
-                            self.enemy_kill_sound.play()
+                        self.play_sound('combat', self.enemy_kill_sound, PRIORITY_HIGH)
                     # Hit from side - take damage
                     elif enemy.alive:
                         self.player.health -= 2
                         if self.player.health <= 0:
                             self.player.alive = False
-            
+        
             # Check checkpoint collisions
-            for checkpoint in self.checkpoints:
+            for checkpoint in self.checkpoints.query(self.player.rect):
                 if self.player.rect.colliderect(checkpoint.rect) and not checkpoint.activated:
                     checkpoint.activate()
+                    self.rebake_static(checkpoint)
                     self.player.set_checkpoint(checkpoint.rect.centerx, checkpoint.rect.centery, self.particles)
-            
-            self.update_camera()
-            
+        
+        self.update_camera()
+        self.stream()
+        
+        # Player.update is mostly collision resolution against the grids
+        with PROFILER.scope("collisions"):
             result = self.player.update(self.platforms, self.spikes, self.coins, self.collectibles, self.goal, self.particles)
-            
-            if result == "dead":
-                self.player.respawn(self.particles)
-                self.player.alive = True
-            elif result == "goal":
-                return True
-            
-            # Play sounds for collected items
-            if self.player.coins > old_coins and self.sounds_enabled:
-                self.coin_sound.play()
-            if self.player.crystals > old_crystals and self.sounds_enabled:
-                self.coin_sound.play()
-            
-            # Play jump sound
-            if self.player.on_ground and old_vel_y > 0 and self.player.vel_y < 0 and self.sounds_enabled:
-                self.jump_sound.play()
-            
-            # Update particles
-            for particle in self.particles[:]:
-                particle.update()
-                if particle.lifetime <= 0:
-                    self.particles.remove(particle)
-            
-            self.draw(screen, font)
-            pygame.display.flip()
+        
+        if result == "dead":
+            self.player.respawn(self.particles)
+            self.player.alive = True
+            self.prev_player_pos = self.player.rect.topleft  # Appear at the checkpoint, don't slide there
+        elif result == "goal":
+            return True
+        
+        # Play sounds for collected items
+        if self.player.coins > old_coins:
+            self.play_sound('pickup', self.coin_sound, PRIORITY_NORMAL)
+        if self.player.crystals > old_crystals:
+            self.play_sound('pickup', self.coin_sound, PRIORITY_HIGH)
+        
+        # Play jump sound
+        if self.player.on_ground and old_vel_y > 0 and self.player.vel_y < 0:
+            self.play_sound('player', self.jump_sound, PRIORITY_LOW)
+        
+        # Update particles
+        self.particles.update()
+        return None
 
-        return False
+    def run(self, screen, clock, font):
+        """Main game loop for level.
+
+        The level is stepped FPS times per second of real time whatever the
+        frame rate; each frame runs as many steps as the time since the last
+        one calls for (at most MAX_STEPS_PER_FRAME) and then draws the level
+        interpolated between the last two steps.
+        """
+        recorder = InputRecorder(self) if RECORD_DIR else None
+        lag = STEP_TIME  # Real time not simulated yet; the first frame runs one step
+        clock.tick()  # Don't count the time spent in menus before the level
+        try:
+            while self.player.alive:
+                lag = min(lag + clock.tick(RENDER_FPS) / 1000, MAX_STEPS_PER_FRAME * STEP_TIME)
+                PROFILER.begin_frame()
+                
+                with PROFILER.scope("events"):
+                    keys = pygame.key.get_pressed()
+                    for event in pygame.event.get():
+                        if event.type == pygame.QUIT:
+                            return None
+                        if event.type == pygame.KEYDOWN:
+                            if event.key == pygame.K_ESCAPE:
+                                return None
+                            PROFILER.handle_event(event)
+                
+                with PROFILER.scope("update"):
+                    while lag >= STEP_TIME and self.player.alive:
+                        lag -= STEP_TIME
+                        finished = self.step(keys)
+                        AUDIO.flush()
+                        if recorder is not None:
+                            recorder.record(keys, self.player)
+                        if finished:
+                            return True
+                
+                with PROFILER.scope("draw"):
+                    self.draw(screen, font, lag / STEP_TIME)
+                PROFILER.present(screen)
+                PROFILER.end_frame()
+
+            return False
+        finally:
+            if recorder is not None:
+                recorder.save_to_dir(RECORD_DIR)
+
+# ============ ENDLESS LEVEL ============
+class EndlessLevel(Level):
+    """Endless run through procedurally generated chunks.
+
+    Chunks are generated and loaded ahead of the camera and unloaded once
+    they are behind both the camera and the last activated checkpoint, so
+    memory and per-frame cost stay flat however far the player gets.
+    """
+
+    def __init__(self, seed):
+        self.loaded_chunks = deque()  # (rows, objects) for each loaded chunk, oldest first
+        super().__init__(0, seed)
+
+    def load_template(self):
+        return {'theme': self.seed % len(LEVEL_THEMES) + 1}
+
+    def generate_level(self):
+        self.title = "Endless Run"
+        self.width = float('inf')
+        self.generator = LevelGenerator(self.seed, JumpModel.from_player(self.player))
+        self.stream()
+
+    def stream(self):
+        """Load chunks ahead of the camera and unload those behind the last checkpoint"""
+        ahead = self.camera_x + SCREEN_WIDTH + CHUNK_WIDTH
+        while self.generator.chunk_index * CHUNK_WIDTH < ahead:
+            rows = self.generator.next_chunk()
+            self.loaded_chunks.append((rows, self.add_rows(rows)))
+
+        # Keep everything the player could respawn into or still see
+        keep_x = min(self.camera_x, self.player.checkpoint_x - SCREEN_WIDTH)
+        while len(self.loaded_chunks) > 1 and self.loaded_chunks[0][0]['end'] < keep_x:
+            rows, objects = self.loaded_chunks.popleft()
+            self.remove_objects(objects)
+            # Nothing left of the unloaded chunk's extent exists any more
+            self.min_x = self.player.min_x = rows['end']
+            for index in [i for i in self.static_chunks if (i + 1) * STATIC_CHUNK_WIDTH <= self.min_x]:
+                del self.static_chunks[index]
+
+    def get_progress_text(self):
+        return f"Distance: {self.player.rect.x // 10}m"
 
 def show_level_complete_menu(screen, clock, font, big_font, level_num, level_stats):
     """Show level complete screen with replay/next options"""
@@ -950,12 +1135,16 @@ def show_menu(screen, clock, font, big_font, player_stats):
         screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 100))
         screen.blit(subtitle, (SCREEN_WIDTH // 2 - subtitle.get_width() // 2, 170))
         
+        profile_text = font.render(f"Profile: {player_stats['profile']}  [P] Switch", True, CYAN)
+        screen.blit(profile_text, (SCREEN_WIDTH // 2 - profile_text.get_width() // 2, 230))
+        
         options = [
             "1. Start Game",
             "2. Replay Levels",
             "3. Shop",
             "4. Tutorial",
-            "5. Exit"
+            "5. Endless Run",
+            "6. Exit"
         ]
         
         for i, option in enumerate(options):
@@ -980,7 +1169,76 @@ def show_menu(screen, clock, font, big_font, player_stats):
                 elif event.key == pygame.K_4:
                     return "tutorial"
                 elif event.key == pygame.K_5:
+                    return "endless"
+                elif event.key == pygame.K_6:
                     return "quit"
+                elif event.key == pygame.K_p:
+                    return "profiles"
+
+def show_profile_picker(screen, clock, font, big_font, current):
+    """Pick a profile or type a new one; returns the chosen name, or None to go back"""
+    store = get_profile_store()
+    names = store.names()
+    entries = names + ["+ New Profile"]
+    selected = names.index(current) if current in names else 0
+    new_name = None  # Name being typed for a new profile
+    visible = 7  # Rows shown at once; the list scrolls with the selection
+    
+    while True:
+        clock.tick(FPS)
+        
+        screen.fill(DARK_BLUE)
+        
+        title = big_font.render("PROFILES", True, YELLOW)
+        screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 50))
+        
+        first = min(max(0, selected - visible // 2), max(0, len(entries) - visible))
+        for row, i in enumerate(range(first, min(len(entries), first + visible))):
+            color = YELLOW if i == selected else WHITE
+            prefix = "> " if i == selected else "  "
+            if i < len(names):
+                data = store.get(names[i])
+                label = f"{prefix}{names[i]} - Level {data.get('highest_level', 1)}, {data.get('crystals', 0)} Crystals"
+            else:
+                label = f"{prefix}{entries[i]}"
+            text = font.render(label, True, color)
+            screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, 150 + row * 55))
+        
+        if new_name is not None:
+            prompt = font.render(f"Name: {new_name}_", True, CYAN)
+            screen.blit(prompt, (SCREEN_WIDTH // 2 - prompt.get_width() // 2, SCREEN_HEIGHT - 110))
+            instructions = font.render("Type a name, [ENTER] to create, [ESC] to cancel", True, LIGHT_BLUE)
+        else:
+            instructions = font.render("Use [UP/DOWN] to select, [ENTER] to choose, [ESC] to go back", True, LIGHT_BLUE)
+        screen.blit(instructions, (SCREEN_WIDTH // 2 - instructions.get_width() // 2, SCREEN_HEIGHT - 50))
+        
+        pygame.display.flip()
+        
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return None
+            if event.type != pygame.KEYDOWN:
+                continue
+            if new_name is not None:
+                if event.key == pygame.K_RETURN and new_name.strip():
+                    return new_name.strip()
+                elif event.key == pygame.K_ESCAPE:
+                    new_name = None
+                elif event.key == pygame.K_BACKSPACE:
+                    new_name = new_name[:-1]
+                elif event.unicode.isprintable() and len(new_name) < 16:
+                    new_name += event.unicode
+            elif event.key == pygame.K_UP:
+                selected = (selected - 1) % len(entries)
+            elif event.key == pygame.K_DOWN:
+                selected = (selected + 1) % len(entries)
+            elif event.key == pygame.K_RETURN:
+                if selected == len(names):
+                    new_name = ""
+                else:
+                    return names[selected]
+            elif event.key == pygame.K_ESCAPE:
+                return None
 
 def show_shop(screen, clock, font, big_font, player_stats):
     """Display shop menu"""
@@ -1109,27 +1367,35 @@ def show_tutorial(screen, clock, font):
 
 def main():
     """Main game loop"""
+    global RECORD_DIR, RENDER_FPS
+    if '--record' in sys.argv:
+        index = sys.argv.index('--record')
+        value = sys.argv[index + 1] if index + 1 < len(sys.argv) else ''
+        RECORD_DIR = value if value and not value.startswith('--') else 'replays'
+    if '--fps' in sys.argv:
+        index = sys.argv.index('--fps')
+        value = sys.argv[index + 1] if index + 1 < len(sys.argv) else ''
+        if value.isdigit():
+            RENDER_FPS = int(value)
+        else:
+            print(f"--fps needs a whole number of frames per second (0 for uncapped); using {RENDER_FPS}")
+    
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Quest Madness")
     clock = pygame.time.Clock()
-    font = pygame.font.Font(None, 36)
-    big_font = pygame.font.Font(None, 72)
+    font = ASSETS.font(None, 36)
+    big_font = ASSETS.font(None, 72)
     
-    # Initialize background music
-    try:
-        pygame.mixer.music.load(MUSIC_FILE)
-        pygame.mixer.music.set_volume(0.5)
-        pygame.mixer.music.play(-1)  # Loop music indefinitely
-        music_enabled = True
-    except Exception as e:
-        print(f"Error loading music: {e}")
-        music_enabled = False
+    # Background music, looped indefinitely
+    music_enabled = ASSETS.play_music(MUSIC_FILE, 0.5)
+    # Decode the level sounds while the menu is up so starting a level doesn't wait on disk
+    ASSETS.preload(sounds=LEVEL_SOUNDS)
     
     # Load saved progress or start fresh
     player_stats = load_progress()
     
     level_num = 1
-    max_levels = 3
+    max_levels = count_levels()
     
     while True:
         choice = show_menu(screen, clock, font, big_font, player_stats)
@@ -1143,6 +1409,26 @@ def main():
             save_progress(player_stats)  # Save after shop purchases
         elif choice == "tutorial":
             show_tutorial(screen, clock, font)
+        elif choice == "profiles":
+            profile = show_profile_picker(screen, clock, font, big_font, player_stats['profile'])
+            if profile is not None and profile != player_stats['profile']:
+                player_stats = load_progress(profile)
+                save_progress(player_stats)  # Creates the profile if it is new
+        elif choice == "endless":
+            level = EndlessLevel(random.randrange(2 ** 31))
+            level.player.health = player_stats['max_health']
+            result = level.run(screen, clock, font)
+            player_stats['crystals'] += level.player.crystals
+            player_stats['coins'] += level.player.coins
+            save_progress(player_stats)
+            if result is False:
+                screen.fill(RED)
+                text = big_font.render("Game Over!", True, YELLOW)
+                subtext = font.render(level.get_progress_text(), True, LIGHT_BLUE)
+                screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - 50))
+                screen.blit(subtext, (SCREEN_WIDTH // 2 - subtext.get_width() // 2, SCREEN_HEIGHT // 2 + 20))
+                pygame.display.flip()
+                pygame.time.wait(2000)
         elif choice == "replay":
             # Replay all levels from level 1
             level_num = 1
@@ -1238,6 +1524,8 @@ def main():
                 pygame.display.flip()
                 pygame.time.wait(3000)
     
+    if '--asset-timings' in sys.argv:
+        print(ASSETS.report())
     pygame.quit()
     sys.exit()
 
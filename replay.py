@@ -0,0 +1,195 @@
+"""Deterministic input recording and headless replay for quest_madness.
+
+A replay file stores everything a level run depends on: the level number
+(0 for an endless run), the level seed, the player's starting health and
+one 16-bit key mask per frame (zlib-compressed). It also stores a digest
+of the player's state after every frame, so a replay can tell whether the
+physics still produce exactly the same run.
+
+Usage: python replay.py replays/level1_20260101-120000.qmr [--repeat 5]
+"""
+import argparse
+import hashlib
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+import pygame
+
+REPLAY_MAGIC = b"QMRP"
+REPLAY_VERSION = 1
+# magic, version, level number, seed, starting health, frame count, digest, compressed size
+HEADER = struct.Struct("<4sBiIiI20sI")
+
+# Every key Player.handle_input reads, one bit each
+RECORDED_KEYS = [
+    pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d,
+    pygame.K_UP, pygame.K_w, pygame.K_SPACE,
+    pygame.K_x, pygame.K_LCTRL, pygame.K_RCTRL,
+]
+KEY_BITS = {key: 1 << bit for bit, key in enumerate(RECORDED_KEYS)}
+
+
+def encode_keys(keys):
+    """Pack the recorded keys of a key state (get_pressed() or ReplayKeys) into a mask"""
+    mask = 0
+    for key, bit in KEY_BITS.items():
+        if keys[key]:
+            mask |= bit
+    return mask
+
+
+class ReplayKeys:
+    """Stands in for pygame.key.get_pressed() with a recorded key mask"""
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        return bool(self.mask & KEY_BITS.get(key, 0))
+
+
+def update_digest(digest, player):
+    """Fold the player's state after a frame into a running hash"""
+    rect = player.rect
+    digest.update(struct.pack("<4i2d3i?", rect.x, rect.y, player.health, player.score,
+                              float(player.vel_x), float(player.vel_y),
+                              player.coins, player.crystals, player.checkpoint_x, player.on_ground))
+
+
+class Replay:
+    """A recorded level run: its setup, per-frame key masks and state digest"""
+
+    def __init__(self, level_num, seed, health, frames=None, digest=b"\0" * 20):
+        self.level_num = level_num
+        self.seed = seed
+        self.health = health
+        self.frames = frames if frames is not None else array("H")
+        self.digest = digest
+
+    def to_bytes(self):
+        frames = self.frames
+        if sys.byteorder != "little":
+            frames = array("H", frames)
+            frames.byteswap()
+        payload = zlib.compress(frames.tobytes(), 9)
+        header = HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.level_num, self.seed,
+                             self.health, len(self.frames), self.digest, len(payload))
+        return header + payload
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, level_num, seed, health, count, digest, size = HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError("not a replay file")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+        frames = array("H")
+        frames.frombytes(zlib.decompress(data[HEADER.size:HEADER.size + size]))
+        if sys.byteorder != "little":
+            frames.byteswap()
+        if len(frames) != count:
+            raise ValueError("truncated replay")
+        return cls(level_num, seed, health, frames, digest)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class InputRecorder:
+    """Records a level run frame by frame as it is played"""
+
+    def __init__(self, level):
+        self.replay = Replay(level.level_num, level.seed, level.player.health)
+        self._digest = hashlib.sha1()
+
+    def record(self, keys, player):
+        """Store one frame's keys and the player state they led to"""
+        self.replay.frames.append(encode_keys(keys))
+        update_digest(self._digest, player)
+
+    def save_to_dir(self, directory):
+        """Write the replay into `directory` under a timestamped name; returns the path"""
+        self.replay.digest = self._digest.digest()
+        os.makedirs(directory, exist_ok=True)
+        name = "endless" if self.replay.level_num == 0 else f"level{self.replay.level_num}"
+        path = os.path.join(directory, f"{name}_{time.strftime('%Y%m%d-%H%M%S')}.qmr")
+        self.replay.save(path)
+        print(f"Replay saved to {path}")
+        return path
+
+
+def make_level(replay):
+    """Rebuild the level a replay was recorded on"""
+    # Imported here: quest_madness initialises pygame and the mixer on import
+    from quest_madness import EndlessLevel, Level
+    if replay.level_num == 0:
+        level = EndlessLevel(replay.seed)
+    else:
+        level = Level(replay.level_num, replay.seed)
+    level.player.health = replay.health
+    level.sounds_enabled = False
+    return level
+
+
+def play(replay):
+    """Run a replay headless as fast as possible.
+
+    Returns (level, frames played, result, matches) where result is True
+    for a finished level, False for a lost one and None for a run that
+    was quit, and matches tells whether the state digest was reproduced.
+    """
+    level = make_level(replay)
+    digest = hashlib.sha1()
+    keys = ReplayKeys()
+    result = None
+    played = 0
+    for mask in replay.frames:
+        keys.mask = mask
+        finished = level.step(keys)
+        update_digest(digest, level.player)
+        played += 1
+        if finished:
+            result = True
+            break
+        if not level.player.alive:
+            result = False
+            break
+    return level, played, result, digest.digest() == replay.digest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded quest_madness run headless")
+    parser.add_argument("path", help="replay file (.qmr)")
+    parser.add_argument("--repeat", type=int, default=1, help="replay this many times and report the best speed")
+    args = parser.parse_args()
+
+    # No window or sound device needed
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    replay = Replay.load(args.path)
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        level, played, result, matches = play(replay)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    outcome = {True: "goal reached", False: "game over", None: "quit"}[result]
+    print(f"{played}/{len(replay.frames)} frames, {outcome}, score {level.player.score}")
+    print(f"{best * 1000:.1f} ms ({played / best:.0f} frames/s)")
+    print("state digest matches the recording" if matches else "STATE DIGEST DIFFERS from the recording")
+    sys.exit(0 if matches else 1)
+
+
+if __name__ == "__main__":
+    main()
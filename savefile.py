@@ -0,0 +1,146 @@
+"""Crash-safe saving helpers: checksums, atomic writes and a background writer.
+
+SAVE_VERSION is the schema version of saved stats. The single-profile save
+file from before the profile store is JSON: {"version", "checksum": sha256
+of the canonical data, "data": {...}}, or a plain dict for version 1; it is
+only read now, to import it (read_save), falling back to <path>.bak.
+"""
+import atexit
+import hashlib
+import json
+import os
+import threading
+
+SAVE_VERSION = 2
+
+
+def checksum(data):
+    """sha256 of the canonical JSON form of `data`"""
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def write_atomic(path, text, keep_backup=True):
+    """Replace `path` with `text` so readers only ever see the old or the new file.
+
+    With `keep_backup` the file being replaced is kept as <path>.bak.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    if keep_backup and os.path.exists(path):
+        os.replace(path, path + ".bak")
+    os.replace(tmp_path, path)
+    # Persist the renames too where the platform allows syncing a directory
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def upgrade(data, version):
+    """Bring saved stats written with schema `version` up to SAVE_VERSION"""
+    if version > SAVE_VERSION:
+        raise ValueError(f"save version {version} is newer than this game")
+    # Version 2 only added the envelope and checksum; the stats are the same as version 1
+    return data
+
+
+def _read_one(path):
+    with open(path, "r") as f:
+        save = json.load(f)
+    if not isinstance(save, dict):
+        raise ValueError("not a save file")
+    if "version" not in save:
+        return upgrade(save, 1)  # Version 1: the bare stats dict, no checksum
+    if save["version"] > SAVE_VERSION:
+        raise ValueError(f"save version {save['version']} is newer than this game")
+    if checksum(save["data"]) != save["checksum"]:
+        raise ValueError("checksum mismatch")
+    return upgrade(save["data"], save["version"])
+
+
+def read_save(path):
+    """Return the data of the newest valid save at `path` (or its backup), or None"""
+    for candidate in (path, path + ".bak"):
+        if not os.path.exists(candidate):
+            continue
+        try:
+            return _read_one(candidate)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Ignoring damaged save {candidate}: {e}")
+    return None
+
+
+class SaveWriter:
+    """Writes save snapshots on a background thread.
+
+    save() only hands over a snapshot and returns immediately; if several
+    arrive while a write is in progress only the newest one is written.
+    Pending snapshots are flushed when the interpreter exits. Subclasses
+    say how snapshots are written (_write) and may change how they are
+    combined (_merge).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.writes = 0
+        self._pending = None
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def save(self, data):
+        """Queue a snapshot of `data`, replacing any snapshot not yet written"""
+        with self._cond:
+            self._pending = self._merge(self._pending, data)
+            self._cond.notify_all()
+
+    def flush(self):
+        """Block until every queued snapshot is on disk"""
+        with self._cond:
+            while self._pending is not None or self._busy:
+                self._cond.wait()
+
+    def close(self):
+        """Flush and stop the writer thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _merge(self, pending, data):
+        return dict(data)  # The newest snapshot replaces the pending one
+
+    def _write(self, data):
+        raise NotImplementedError
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                data, self._pending = self._pending, None
+                self._busy = True
+            try:
+                self._write(data)
+                self.writes += 1
+            except (OSError, TypeError, ValueError) as e:
+                print(f"Error saving progress: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
@@ -0,0 +1,82 @@
+"""Uniform-grid spatial index for level objects"""
+
+class SpatialGrid:
+    """Buckets objects with a `rect` into square cells so collision and
+    visibility queries only touch nearby objects.
+
+    Iterating the grid yields every object in insertion order, so it can
+    replace the plain list or sprite Group a level kept before. Objects that
+    move call move() and are only re-bucketed when they cross a cell edge.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> {obj: None}
+        self.spans = {}  # obj -> (cx0, cy0, cx1, cy1), insertion ordered
+
+    def __iter__(self):
+        return iter(list(self.spans))
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __contains__(self, obj):
+        return obj in self.spans
+
+    def _span(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def _link(self, obj, span):
+        cx0, cy0, cx1, cy1 = span
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                self.cells.setdefault((cx, cy), {})[obj] = None
+
+    def _unlink(self, obj, span):
+        cx0, cy0, cx1, cy1 = span
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = self.cells[(cx, cy)]
+                del cell[obj]
+                if not cell:
+                    del self.cells[(cx, cy)]
+
+    def add(self, obj, bounds=None):
+        """Insert `obj`; `bounds` overrides obj.rect (e.g. to cover a bobbing pickup's range)"""
+        span = self._span(bounds if bounds is not None else obj.rect)
+        self.spans[obj] = span
+        self._link(obj, span)
+
+    def remove(self, obj):
+        self._unlink(obj, self.spans.pop(obj))
+
+    def move(self, obj, bounds=None):
+        """Re-bucket `obj` after it moved; a no-op unless it crossed into other cells"""
+        span = self._span(bounds if bounds is not None else obj.rect)
+        old = self.spans[obj]
+        if span != old:
+            self._unlink(obj, old)
+            self._link(obj, span)
+            self.spans[obj] = span
+
+    def query(self, rect):
+        """Return the objects in the cells overlapped by `rect` (candidates, not exact hits)"""
+        size = self.cell_size
+        cx0 = rect.left // size
+        cy0 = rect.top // size
+        cx1 = (rect.right - 1) // size
+        cy1 = (rect.bottom - 1) // size
+        found = {}
+        cells = self.cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        return list(found)
+
+    def clear(self):
+        self.cells.clear()
+        self.spans.clear()
@@ -5,14 +5,21 @@ from constants import *
 # Simple cache to avoid recreating surfaces every frame
 _WEAPON_CACHE = {}
 
-def get_weapon_surface(name, color, scale=2):
+def get_weapon_surface(name, color, scale=2, facing=1):
     """Return a pygame.Surface for the weapon `name` colored with `color`.
-    Surfaces are cached by (name,color,scale).
+    facing=-1 returns the horizontally mirrored version.
+    Surfaces are cached by (name,color,scale,facing).
     """
-    key = (name, color, scale)
+    key = (name, color, scale, facing)
     if key in _WEAPON_CACHE:
         return _WEAPON_CACHE[key]
 
+    if facing == -1:
+        # mirror the right-facing surface once instead of flipping every frame
+        surf = pygame.transform.flip(get_weapon_surface(name, color, scale), True, False)
+        _WEAPON_CACHE[key] = surf
+        return surf
+
     # base dimensions (relative)
     info = WEAPONS.get(name, {})
     w = info.get("width", 40) * scale